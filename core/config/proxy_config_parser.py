@@ -1,14 +1,24 @@
 from __future__ import annotations
 
-import tomllib
+import contextlib
+import hashlib
+import io
+import os
 from pathlib import Path
-from typing import Any, Literal
+from types import MappingProxyType
+from typing import Any, Callable, Literal, Mapping
 from dataclasses import dataclass
 
+try:
+    import rtoml  # Optional native parser, much faster than tomllib
+except ImportError:
+    rtoml = None
+
 ProxyType = Literal["socks5", "http"]
+_PROXY_TYPES: frozenset[str] = frozenset(ProxyType.__args__)
 
 # Config structure
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProxyConfig:
     listen_address: str
     listen_port: int
@@ -17,10 +27,18 @@ class ProxyConfig:
     run_on_startup: bool = False
     ssh_username: str | None = None
 
+    def __post_init__(self) -> None:
+        _check_port(self.listen_port, "listen_port")
+        _check_port(self.bind_port, "bind_port")
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SProxy2Config:
-    proxies: dict[str, ProxyConfig]
+    proxies: Mapping[str, ProxyConfig]
+
+    def __post_init__(self) -> None:
+        # Read-only view over a private copy so the config can't be mutated in place
+        object.__setattr__(self, "proxies", MappingProxyType(dict(self.proxies)))
 
 
 def _require(mapping: dict[str, Any], key: str, ctx: str) -> Any:
@@ -29,22 +47,35 @@ def _require(mapping: dict[str, Any], key: str, ctx: str) -> Any:
     return mapping[key]
 
 
+def _int_from_str(v: str, ctx: str) -> int:
+    if v.isdigit():
+        return int(v)
+    raise ValueError(f"Expected integer in {ctx}, got str")
+
+
+# Dispatch on exact type: one identity lookup instead of an isinstance chain
+_INT_COERCERS: dict[type, Callable[[Any, str], int]] = {
+    int: lambda v, ctx: v,
+    str: _int_from_str,
+}
+
+
 def _as_int(v: Any, ctx: str) -> int:
-    if isinstance(v, bool):
+    t = type(v)
+    if t is bool:
         raise ValueError(f"Expected integer in {ctx}, got boolean")
-    if isinstance(v, int):
-        return v
-    if isinstance(v, str) and v.isdigit():
-        return int(v)
-    raise ValueError(f"Expected integer in {ctx}, got {type(v).__name__}")
+    coerce = _INT_COERCERS.get(t)
+    if coerce is None:
+        raise ValueError(f"Expected integer in {ctx}, got {t.__name__}")
+    return coerce(v, ctx)
 
 def _as_proxy_type(v: Any, ctx: str) -> ProxyType:
-    if isinstance(v, str) and v in (ProxyType.__args__):
-        return v
+    if isinstance(v, str) and v in _PROXY_TYPES:
+        return v  # type: ignore[return-value]
     raise ValueError(f"Expected proxy type ('socks5' or 'http') in {ctx}, got {v!r}")
 
 def _as_str(v: Any, ctx: str) -> str:
-    if isinstance(v, str):
+    if type(v) is str:
         return v
     raise ValueError(f"Expected string in {ctx}, got {type(v).__name__}")
 
@@ -55,21 +86,66 @@ def _check_port(p: int, ctx: str) -> int:
     return p
 
 
-def validate_proxies(proxies: dict[str, ProxyConfig]) -> None:
+def validate_proxies(proxies: Mapping[str, ProxyConfig]) -> None:
     """Validate proxy configuration for duplicate listen endpoints."""
-    listen_endpoints: set[tuple[str, int]] = set()
-    
-    for name, proxy in proxies.items():
-        endpoint = (proxy.listen_address, proxy.listen_port)
-        if endpoint in listen_endpoints:
+    endpoints = [(proxy.listen_address, proxy.listen_port) for proxy in proxies.values()]
+    if len(set(endpoints)) == len(endpoints):
+        return
+
+    # Slow path: report the first proxy, in config order, whose endpoint was already taken
+    seen: set[tuple[str, int]] = set()
+    for name, endpoint in zip(proxies, endpoints):
+        if endpoint in seen:
+            raise ValueError(
+                f"Duplicate listen endpoint {endpoint[0]}:{endpoint[1]} for proxy '{name}'"
+            )
+        seen.add(endpoint)
+
+
+def validate_one_against(existing: Mapping[str, ProxyConfig], name: str, proxy: ProxyConfig) -> None:
+    """Check that a proxy about to be added doesn't reuse an existing listen endpoint."""
+    endpoint = (proxy.listen_address, proxy.listen_port)
+    for other in existing.values():
+        if (other.listen_address, other.listen_port) == endpoint:
             raise ValueError(
-                f"Duplicate listen endpoint {proxy.listen_address}:{proxy.listen_port} for proxy '{name}'"
+                f"Duplicate listen endpoint {endpoint[0]}:{endpoint[1]} for proxy '{name}'"
             )
-        listen_endpoints.add(endpoint)
+
+
+# Parsed configs keyed by (absolute path, SHA-256 of the bytes) so unchanged files are not re-parsed.
+# The file is always read and hashed: mtime/size can miss edits on coarse-timestamp filesystems.
+# Entries are immutable SProxy2Config objects, safe to hand to every caller without copying
+_PARSE_CACHE_MAX = 32
+_PARSE_CACHE: dict[tuple[str, bytes], SProxy2Config] = {}
+
+
+def _read_toml(data: bytes) -> Any:
+    text = data.decode("utf-8")
+    if rtoml is not None:
+        return rtoml.loads(text)
+    # Imported lazily so startup paths that never parse config skip tomllib's setup
+    import tomllib
+    return tomllib.loads(text)
 
 
 def load_config(path: Path) -> SProxy2Config:
-    raw = tomllib.loads(path.read_text(encoding="utf-8"))
+    data = path.read_bytes()
+    key = (os.path.abspath(path), hashlib.sha256(data).digest())
+    cached = _PARSE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    config = _parse_config(data)
+
+    # FIFO eviction keeps the cache bounded
+    if len(_PARSE_CACHE) >= _PARSE_CACHE_MAX:
+        del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+    _PARSE_CACHE[key] = config
+    return config
+
+
+def _parse_config(data: bytes) -> SProxy2Config:
+    raw = _read_toml(data)
     if not isinstance(raw, dict):
         raise ValueError("Top-level config must be a table")
 
@@ -92,17 +168,17 @@ def load_config(path: Path) -> SProxy2Config:
         ssh_username_raw = tbl.get("ssh_username", None)
         ssh_username = _as_str(ssh_username_raw, f"{ctx}.ssh_username") if ssh_username_raw is not None else None
 
-        _check_port(listen_port, f"{ctx}.listen_port")
-        _check_port(bind_port, f"{ctx}.bind_port")
-
-        proxies[name] = ProxyConfig(
-            listen_address=listen_address,
-            listen_port=listen_port,
-            bind_port=bind_port,
-            proxy_type=proxy_type,
-            run_on_startup=run_on_startup,
-            ssh_username=ssh_username,
-        )
+        try:
+            proxies[name] = ProxyConfig(
+                listen_address=listen_address,
+                listen_port=listen_port,
+                bind_port=bind_port,
+                proxy_type=proxy_type,
+                run_on_startup=run_on_startup,
+                ssh_username=ssh_username,
+            )
+        except ValueError as e:
+            raise ValueError(f"{e} (in {ctx})") from None
 
     # Validate for duplicate endpoints
     validate_proxies(proxies)
@@ -110,29 +186,41 @@ def load_config(path: Path) -> SProxy2Config:
     return SProxy2Config(proxies=proxies)
 
 
+# Exactly what dump_config() produces for the single "example" proxy; written verbatim on first launch
+_DEFAULT_CONFIG_BYTES = b"""# SProxy2 Configuration
+# Generated automatically
+
+[proxies.example]
+listen_address = "127.0.0.1"
+listen_port = 1080
+bind_port = 10800
+proxy_type = "socks5"
+"""
+
+
 def write_default_config(path: Path) -> None:
     """
     Writes a valid starter config that your load_config() can parse.
     """
-    default_cfg = SProxy2Config(
-        proxies={
-            "example": ProxyConfig(
-                listen_address="127.0.0.1",
-                listen_port=1080,
-                bind_port=10800,
-                proxy_type="socks5",
-                run_on_startup=False,
-                ssh_username=None,
-            )
-        }
-    )
-    path.write_text(dump_config(default_cfg), encoding="utf-8")
+    path.write_bytes(_DEFAULT_CONFIG_BYTES)
+
+
+# Minimal TOML string escaping (enough for normal names/addresses).
+# If you expect arbitrary strings, extend this table.
+_TOML_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"'})
 
 
 def _toml_escape(s: str) -> str:
-    # Minimal TOML string escaping (enough for normal names/addresses).
-    # If you expect arbitrary strings, expand this.
-    return s.replace("\\", "\\\\").replace('"', '\\"')
+    return s.translate(_TOML_ESCAPES)
+
+
+_PROXY_TEMPLATE = (
+    "[proxies.{name}]\n"
+    'listen_address = "{addr}"\n'
+    "listen_port = {lp}\n"
+    "bind_port = {bp}\n"
+    'proxy_type = "{pt}"\n'
+)
 
 
 def dump_config(config: SProxy2Config) -> str:
@@ -143,30 +231,43 @@ def dump_config(config: SProxy2Config) -> str:
       listen_port = 1080
       bind_port = 10800
     """
-    lines: list[str] = []
-    lines.append("# SProxy2 Configuration")
-    lines.append("# Generated automatically")
-    lines.append("")
+    buf = io.StringIO()
+    buf.write("# SProxy2 Configuration\n# Generated automatically\n\n")
 
     # Stable ordering is nice for diffs
-    for name in sorted(config.proxies.keys()):
-        proxy = config.proxies[name]
-        lines.append(f"[proxies.{name}]")
-        lines.append(f'listen_address = "{_toml_escape(proxy.listen_address)}"')
-        lines.append(f"listen_port = {int(proxy.listen_port)}")
-        lines.append(f"bind_port = {int(proxy.bind_port)}")
-        lines.append(f'proxy_type = "{proxy.proxy_type}"')
+    proxies = config.proxies
+    for name in sorted(proxies):
+        proxy = proxies[name]
+        buf.write(_PROXY_TEMPLATE.format_map({
+            "name": name,
+            "addr": _toml_escape(proxy.listen_address),
+            "lp": int(proxy.listen_port),
+            "bp": int(proxy.bind_port),
+            "pt": proxy.proxy_type,
+        }))
         if proxy.ssh_username:
-            lines.append(f'ssh_username = "{_toml_escape(proxy.ssh_username)}"')
+            buf.write(f'ssh_username = "{_toml_escape(proxy.ssh_username)}"\n')
         if proxy.run_on_startup:
-            lines.append("run_on_startup = true")
-        lines.append("")
+            buf.write("run_on_startup = true\n")
+        buf.write("\n")
 
-    return "\n".join(lines)
+    # Blocks are separated by a blank line; the file ends with a single newline
+    return buf.getvalue()[:-1]
 
 
 def save_config(path: Path, config: SProxy2Config) -> None:
     """
     Convenience helper: write config to disk.
+    The new file replaces the old one in one step, so a crash mid-write never truncates it.
     """
-    path.write_text(dump_config(config), encoding="utf-8")
\ No newline at end of file
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(dump_config(config))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp_path.unlink()
+        raise
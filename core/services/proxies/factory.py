@@ -1,11 +1,20 @@
-from core.config.proxy_config_parser import ProxyConfig
+from core.config.proxy_config_parser import ProxyConfig, ProxyType
 
 from .http_proxy import HttpProxy
 from .socks5_proxy import Socks5Proxy
 from .proxy import ProxyBase
 
 
+# Keyed by every ProxyType literal; adding a proxy type means one entry here
+_PROXY_CTORS: dict[ProxyType, type[ProxyBase]] = {
+    "http": HttpProxy,
+    "socks5": Socks5Proxy,
+}
+
+
 def create_proxy(config: ProxyConfig) -> ProxyBase:
-    if config.proxy_type == "http":
-        return HttpProxy(config)
-    return Socks5Proxy(config)
+    try:
+        cls = _PROXY_CTORS[config.proxy_type]
+    except KeyError:
+        raise ValueError(f"Unsupported proxy type {config.proxy_type!r}") from None
+    return cls(config)
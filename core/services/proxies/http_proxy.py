@@ -1,16 +1,184 @@
 import asyncio
+import contextlib
 import logging
-import subprocess
+import re
+import socket
+from collections import defaultdict, deque
 
 from .proxy import ProxyBase
+from .relay import RELAY_CHUNK_SIZE, set_relay_buffer_limits, write_relayed
+from .splice_relay import splice_relay
 
 logger = logging.getLogger(__name__)
 
+# Client headers not forwarded upstream: the hop-by-hop Proxy-Connection, Host (rebuilt
+# from the request target, so it is never sent twice) and Expect (answered by the proxy)
+_DROPPED_REQUEST_HEADERS_RE = re.compile(rb"(?im)^(?:proxy-connection|host|expect):[^\n]*\r?\n")
+_EXPECT_CONTINUE_RE = re.compile(rb"(?im)^expect:[ \t]*100-continue")
+
+
+def _strip_request_headers(header_block: bytes) -> bytes:
+    return _DROPPED_REQUEST_HEADERS_RE.sub(b"", header_block)
+
+
+# Raised by the framing helpers when a message can't be delimited; the connection is then unusable
+_FRAMING_ERRORS = (ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError)
+
+# Idle upstream connections kept per (host, port), and how long they may sit idle
+_POOL_MAX_PER_HOST = 8
+_POOL_IDLE_TIMEOUT = 30.0
+
+
+# getaddrinfo results per (host, port), so repeat requests skip the resolver thread pool
+_DNS_TTL = 60.0
+_DNS_CACHE_MAX = 1024
+_DNS_CACHE: dict[tuple[str, int], tuple[float, list]] = {}
+
+
+async def _resolve(host: str, port: int) -> list:
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+    cached = _DNS_CACHE.get((host, port))
+    if cached is not None and now - cached[0] < _DNS_TTL:
+        return cached[1]
+    infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    if len(_DNS_CACHE) >= _DNS_CACHE_MAX:
+        _DNS_CACHE.clear()
+    _DNS_CACHE[(host, port)] = (now, infos)
+    return infos
+
+
+async def _open_upstream(host: str, port: int):
+    """open_connection() using cached DNS; tries each resolved address in turn."""
+    loop = asyncio.get_running_loop()
+    last_error: OSError | None = None
+    for family, type_, proto, _, sockaddr in await _resolve(host, port):
+        sock = socket.socket(family, type_, proto)
+        try:
+            sock.setblocking(False)
+            # Connect to the full sockaddr so IPv6 flowinfo/scope id (link-local) survive
+            await loop.sock_connect(sock, sockaddr)
+        except OSError as e:
+            sock.close()
+            last_error = e
+            continue
+        except BaseException:
+            sock.close()
+            raise
+        return await asyncio.open_connection(sock=sock)
+    raise last_error or OSError(f"No addresses found for {host}")
+
+
+def _split_host_port(authority: bytes, default_port: int) -> tuple[str, int]:
+    """Split b'host:port' or b'[v6addr]:port' straight from the request bytes."""
+    if authority.startswith(b'['):
+        end = authority.find(b']')
+        if end < 0:
+            raise ValueError(f"Malformed IPv6 authority {authority!r}")
+        port = int(authority[end + 2:]) if authority[end + 1:end + 2] == b':' else default_port
+        return authority[1:end].decode('ascii'), port
+    colon = authority.rfind(b':')
+    if colon < 0:
+        return authority.decode('ascii'), default_port
+    return authority[:colon].decode('ascii'), int(authority[colon + 1:])
+
+
+def _parse_headers(block: bytes) -> dict[bytes, bytes]:
+    """Header name -> value, both lowercased, from CRLF-separated header lines."""
+    headers: dict[bytes, bytes] = {}
+    for line in block.split(b'\r\n'):
+        name, sep, value = line.partition(b':')
+        if sep:
+            headers[name.strip().lower()] = value.strip().lower()
+    return headers
+
+
+def _parse_response_head(head: bytes) -> tuple[bytes, int, dict[bytes, bytes]]:
+    """Returns (http_version, status, headers) with lowercased header names/values."""
+    status_line, _, rest = head.partition(b'\r\n')
+    version, status, _ = (status_line.split(b' ', 2) + [b''])[:3]
+    return version, int(status), _parse_headers(rest)
+
+
+async def _relay_exact(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, length: int) -> None:
+    """Relay exactly `length` bytes; IncompleteReadError if the sender stops short."""
+    while length:
+        data = await reader.read(min(length, RELAY_CHUNK_SIZE))
+        if not data:
+            raise asyncio.IncompleteReadError(b'', length)
+        length -= len(data)
+        await write_relayed(writer, data)
+
+
+async def _relay_chunked(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Relay a chunked body, trailers included, exactly as framed by the sender."""
+    while True:
+        size_line = await reader.readuntil(b'\r\n')
+        size = int(size_line.split(b';', 1)[0], 16)
+        if size < 0:
+            raise ValueError(f"Negative chunk size {size}")
+        await write_relayed(writer, size_line)
+        if size == 0:
+            break
+        chunk = await reader.readexactly(size + 2)
+        if chunk[-2:] != b'\r\n':
+            raise ValueError("Chunk not terminated by CRLF")
+        await write_relayed(writer, chunk)
+    # Trailers, terminated by an empty line
+    while True:
+        line = await reader.readuntil(b'\r\n')
+        await write_relayed(writer, line)
+        if line == b'\r\n':
+            return
+
+
+def _content_length(headers: dict[bytes, bytes]) -> int | None:
+    value = headers.get(b'content-length')
+    if value is None:
+        return None
+    length = int(value)
+    if length < 0:
+        raise ValueError(f"Negative Content-Length {length}")
+    return length
+
+
+async def _relay_request_body(headers: dict[bytes, bytes], client_reader: asyncio.StreamReader, remote_writer: asyncio.StreamWriter) -> None:
+    if b'chunked' in headers.get(b'transfer-encoding', b''):
+        await _relay_chunked(client_reader, remote_writer)
+    else:
+        length = _content_length(headers)
+        if length:
+            await _relay_exact(client_reader, remote_writer, length)
+    await remote_writer.drain()
+
+
+async def _read_final_head(remote_reader: asyncio.StreamReader) -> tuple[bytes, bytes, int, dict[bytes, bytes]]:
+    """Read response heads until a final one; interim 1xx responses (except 101) are dropped."""
+    while True:
+        head = await remote_reader.readuntil(b'\r\n\r\n')
+        version, status, headers = _parse_response_head(head)
+        if not 100 <= status < 200 or status == 101:
+            return head, version, status, headers
+
+
+class _IdleUpstream:
+    """A pooled keep-alive connection and the timer that expires it."""
+
+    __slots__ = ("reader", "writer", "timer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.timer: asyncio.TimerHandle | None = None
+
+
 class HttpProxy(ProxyBase):
     def __init__(self, config):
         super().__init__(config)
         self._server = None
         self._ssh_process = None
+        # Idle keep-alive upstream connections: (host, port) -> _IdleUpstream
+        self._pool: dict[tuple[str, int], deque] = defaultdict(deque)
 
     async def run(self) -> None:
         # Note: SSH doesn't natively support HTTP proxy tunneling like it does SOCKS5
@@ -34,16 +202,10 @@ class HttpProxy(ProxyBase):
             logger.info(f"HTTP proxy listening on 127.0.0.1:{self.config.bind_port}")
             
             async with self._server:
-                # Wait for stop event with periodic health checks
-                while not self._stop_event.is_set():
-                    try:
-                        await asyncio.wait_for(self._stop_event.wait(), timeout=5.0)
-                    except asyncio.TimeoutError:
-                        # Health check passed, continue
-                        if self._server is None or self._server.is_serving() == False:
-                            logger.error("Server stopped unexpectedly")
-                            raise RuntimeError("Server is no longer serving")
-                        continue
+                # Sleep until stopped; serve_forever only returns if the server dies
+                if not await self._wait_stop_or(self._server.serve_forever()):
+                    logger.error("Server stopped unexpectedly")
+                    raise RuntimeError("Server is no longer serving")
             
             logger.info(f"HTTP proxy {self.config.listen_address}:{self.config.listen_port} stopped")
         except asyncio.CancelledError:
@@ -53,77 +215,91 @@ class HttpProxy(ProxyBase):
             logger.error(f"HTTP proxy error: {e}")
             raise
         finally:
+            self._close_pool()
             if self._server:
                 self._server.close()
-                try:
+                with contextlib.suppress(OSError):
                     await self._server.wait_closed()
-                except:
-                    pass
+
+    async def _acquire_upstream(self, host: str, port: int, pooled: bool = True):
+        """Returns (reader, writer, reused), preferring an idle pooled connection if `pooled`."""
+        idle = self._pool.get((host, port)) if pooled else None
+        while idle:
+            entry = idle.pop()
+            entry.timer.cancel()
+            if not entry.writer.is_closing() and not entry.reader.at_eof():
+                return entry.reader, entry.writer, True
+            entry.writer.close()
+        reader, writer = await _open_upstream(host, port)
+        return reader, writer, False
+
+    def _release_upstream(self, host: str, port: int, reader, writer) -> None:
+        """Return a connection to the pool, or close it if the pool is full."""
+        idle = self._pool[(host, port)]
+        if len(idle) >= _POOL_MAX_PER_HOST or self._stop_event.is_set():
+            writer.close()
+            return
+        # Keep the timer out of its own args: debug-mode repr() of the handle would recurse into it
+        entry = _IdleUpstream(reader, writer)
+        entry.timer = asyncio.get_running_loop().call_later(
+            _POOL_IDLE_TIMEOUT, self._expire_upstream, idle, entry
+        )
+        idle.append(entry)
+
+    def _expire_upstream(self, idle: deque, entry: _IdleUpstream) -> None:
+        try:
+            idle.remove(entry)
+        except ValueError:
+            return
+        entry.writer.close()
+
+    def _close_pool(self) -> None:
+        for idle in self._pool.values():
+            for entry in idle:
+                entry.timer.cancel()
+                entry.writer.close()
+        self._pool.clear()
 
     async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle incoming HTTP CONNECT requests."""
         try:
-            # Read the HTTP request line
-            request_line = await reader.readline()
-            request_str = request_line.decode('utf-8', errors='ignore').strip()
-            
-            if not request_str:
-                writer.close()
-                await writer.wait_closed()
+            # Read the request line and headers in one go (bounded by the reader limit)
+            try:
+                raw = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
                 return
             
             # Parse request
-            parts = request_str.split()
+            request_line, _, header_block = raw.partition(b'\r\n')
+            parts = request_line.split(b' ', 2)
             if len(parts) < 2:
-                writer.close()
-                await writer.wait_closed()
                 return
             
-            method = parts[0]
-            target = parts[1]
-            
-            # Read headers
-            headers = {}
-            while True:
-                line = await reader.readline()
-                if line == b'\r\n' or line == b'\n':
-                    break
-                if line:
-                    header_str = line.decode('utf-8', errors='ignore').strip()
-                    if ':' in header_str:
-                        key, value = header_str.split(':', 1)
-                        headers[key.strip()] = value.strip()
+            method, target = parts[0], parts[1]
             
             # Handle CONNECT method for HTTPS
-            if method == 'CONNECT':
+            if method == b'CONNECT':
                 await self._handle_connect(target, reader, writer)
             else:
                 # Handle regular HTTP request
-                await self._handle_http(method, target, headers, reader, writer)
+                await self._handle_http(method, target, header_block, reader, writer)
                 
         except Exception as e:
             logger.error(f"Error handling client: {e}")
         finally:
-            try:
+            with contextlib.suppress(OSError):
                 writer.close()
                 await writer.wait_closed()
-            except:
-                pass
 
-    async def _handle_connect(self, target: str, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
+    async def _handle_connect(self, target: bytes, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
         """Handle HTTP CONNECT for HTTPS tunneling."""
         try:
             # Parse target host:port
-            if ':' in target:
-                host, port_str = target.rsplit(':', 1)
-                port = int(port_str)
-            else:
-                host = target
-                port = 443
+            host, port = _split_host_port(target, 443)
             
             # Connect to target server
             try:
-                remote_reader, remote_writer = await asyncio.open_connection(host, port)
+                remote_reader, remote_writer = await _open_upstream(host, port)
             except Exception as e:
                 logger.error(f"Failed to connect to {host}:{port}: {e}")
                 client_writer.write(b'HTTP/1.1 502 Bad Gateway\r\n\r\n')
@@ -134,85 +310,139 @@ class HttpProxy(ProxyBase):
             client_writer.write(b'HTTP/1.1 200 Connection Established\r\n\r\n')
             await client_writer.drain()
             
-            # Relay data bidirectionally
-            await self._relay_data(client_reader, client_writer, remote_reader, remote_writer)
+            # Relay data bidirectionally, in kernel space when the platform allows it
+            if not await splice_relay(client_reader, client_writer, remote_reader, remote_writer):
+                await self._relay_data(client_reader, client_writer, remote_reader, remote_writer)
             
         except Exception as e:
             logger.error(f"CONNECT error: {e}")
 
-    async def _handle_http(self, method: str, target: str, headers: dict, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
+    async def _handle_http(self, method: bytes, target: bytes, header_block: bytes, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
         """Handle regular HTTP requests."""
         try:
             # Parse target URL
-            if target.startswith('http://'):
+            if target.startswith(b'http://'):
                 target = target[7:]
             
-            if '/' in target:
-                host_port, path = target.split('/', 1)
-                path = '/' + path
+            slash = target.find(b'/')
+            if slash >= 0:
+                host_port, path = target[:slash], target[slash:]
             else:
-                host_port = target
-                path = '/'
+                host_port, path = target, b'/'
             
-            if ':' in host_port:
-                host, port_str = host_port.rsplit(':', 1)
-                port = int(port_str)
-            else:
-                host = host_port
-                port = 80
-            
-            # Connect to target server
-            try:
-                remote_reader, remote_writer = await asyncio.open_connection(host, port)
-            except Exception as e:
-                logger.error(f"Failed to connect to {host}:{port}: {e}")
-                client_writer.write(b'HTTP/1.1 502 Bad Gateway\r\n\r\n')
-                await client_writer.drain()
-                return
+            host, port = _split_host_port(host_port, 80)
             
-            # Forward the request
-            request = f"{method} {path} HTTP/1.1\r\n"
-            request += f"Host: {host}\r\n"
-            for key, value in headers.items():
-                if key.lower() not in ['proxy-connection']:
-                    request += f"{key}: {value}\r\n"
-            request += "\r\n"
+            # Forward the request with the client's header bytes, minus the ones the proxy owns
+            request = (
+                method + b' ' + path + b' HTTP/1.1\r\nHost: ' + host_port + b'\r\n'
+                + _strip_request_headers(header_block)
+            )
+            request_headers = _parse_headers(header_block)
+            has_body = b'transfer-encoding' in request_headers or b'content-length' in request_headers
             
-            remote_writer.write(request.encode())
-            await remote_writer.drain()
+            if has_body and _EXPECT_CONTINUE_RE.search(header_block):
+                # Expect was stripped, so let the client send its body straight away
+                client_writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
             
-            # Relay response back to client
             while True:
-                data = await remote_reader.read(8192)
-                if not data:
+                # Connect to target server (or reuse an idle keep-alive connection).
+                # A request body is streamed and can't be replayed, so it always gets a fresh one.
+                try:
+                    remote_reader, remote_writer, reused = await self._acquire_upstream(host, port, pooled=not has_body)
+                except Exception as e:
+                    logger.error(f"Failed to connect to {host}:{port}: {e}")
+                    client_writer.write(b'HTTP/1.1 502 Bad Gateway\r\n\r\n')
+                    await client_writer.drain()
+                    return
+                
+                try:
+                    remote_writer.write(request)
+                    await remote_writer.drain()
+                    if has_body:
+                        await _relay_request_body(request_headers, client_reader, remote_writer)
+                    head, version, status, headers = await _read_final_head(remote_reader)
                     break
-                client_writer.write(data)
+                except (OSError, asyncio.IncompleteReadError) as e:
+                    remote_writer.close()
+                    if not reused:
+                        raise
+                    # The pooled connection went stale while idle, retry
+                    logger.debug(f"Retrying on a new connection to {host}:{port}: {e}")
+                except BaseException:
+                    # Oversized or malformed head, client went away, cancellation...
+                    remote_writer.close()
+                    raise
+            
+            try:
+                # Relay response back to client
+                set_relay_buffer_limits(client_writer)
+                client_writer.write(head)
+                reusable = await self._relay_response_body(method, version, status, headers, remote_reader, client_writer)
                 await client_writer.drain()
+            except BaseException:
+                remote_writer.close()
+                raise
             
-            remote_writer.close()
-            await remote_writer.wait_closed()
+            if reusable:
+                self._release_upstream(host, port, remote_reader, remote_writer)
+            else:
+                remote_writer.close()
+                with contextlib.suppress(OSError):
+                    await remote_writer.wait_closed()
             
         except Exception as e:
             logger.error(f"HTTP request error: {e}")
 
+    async def _relay_response_body(self, method: bytes, version: bytes, status: int, headers: dict[bytes, bytes], remote_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> bool:
+        """Relay the response body. Returns True if the upstream connection can be reused."""
+        connection = headers.get(b'connection', b'')
+        if version == b'HTTP/1.0':
+            keep_alive = b'keep-alive' in connection
+        else:
+            keep_alive = b'close' not in connection
+        
+        if method == b'HEAD' or status in (204, 304):
+            return keep_alive
+        
+        if status != 101:
+            try:
+                if b'chunked' in headers.get(b'transfer-encoding', b''):
+                    await _relay_chunked(remote_reader, client_writer)
+                    return keep_alive
+                content_length = _content_length(headers)
+                if content_length is not None:
+                    await _relay_exact(remote_reader, client_writer, content_length)
+                    return keep_alive
+            except _FRAMING_ERRORS as e:
+                # What was relayed so far is all the client gets; the upstream is closed
+                logger.warning(f"Malformed or truncated response body: {e}")
+                return False
+        
+        # No framing information (or a protocol switch): the body runs until the server closes
+        while True:
+            data = await remote_reader.read(RELAY_CHUNK_SIZE)
+            if not data:
+                break
+            await write_relayed(client_writer, data)
+        return False
+
     async def _relay_data(self, client_reader, client_writer, remote_reader, remote_writer):
         """Relay data between client and remote server."""
+        set_relay_buffer_limits(client_writer, remote_writer)
+        
         async def forward(reader, writer):
             try:
                 while True:
-                    data = await reader.read(8192)
+                    data = await reader.read(RELAY_CHUNK_SIZE)
                     if not data:
                         break
-                    writer.write(data)
-                    await writer.drain()
-            except:
+                    await write_relayed(writer, data)
+            except (OSError, asyncio.IncompleteReadError):
                 pass
             finally:
-                try:
+                with contextlib.suppress(OSError):
                     writer.close()
                     await writer.wait_closed()
-                except:
-                    pass
         
         await asyncio.gather(
             forward(client_reader, remote_writer),
@@ -13,13 +13,19 @@ class ProxyBase(ABC):
     def __init__(self, config: ProxyConfig):
         self.config = config
         self._task: asyncio.Task | None = None
-        self._stop_event = asyncio.Event()
+        # Created on first start() so constructing a proxy needs no event loop
+        self._stop_event: asyncio.Event | None = None
         self.is_running = False
 
+    def _ensure_stop_event(self) -> asyncio.Event:
+        if self._stop_event is None:
+            self._stop_event = asyncio.Event()
+        return self._stop_event
+
     async def start(self) -> None:
         if self.is_running:
             return
-        self._stop_event.clear()
+        self._ensure_stop_event().clear()
         self._task = asyncio.create_task(self._run_with_monitoring())
         self.is_running = True
 
@@ -36,11 +42,22 @@ class ProxyBase(ABC):
             self.is_running = False
 
     async def stop(self) -> None:
+        if not self.is_running:
+            return
+        self.request_stop()
+        await self.wait_task()
+
+    def request_stop(self) -> None:
+        """Signal the proxy to stop without waiting, so many can be cancelled at once."""
         if not self.is_running:
             return
         self._stop_event.set()
         if self._task:
             self._task.cancel()
+
+    async def wait_task(self) -> None:
+        """Wait for the proxy task to finish after request_stop()."""
+        if self._task:
             try:
                 await self._task
             except asyncio.CancelledError:
@@ -48,7 +65,22 @@ class ProxyBase(ABC):
         self.is_running = False
 
     async def wait_stopped(self) -> None:
-        await self._stop_event.wait()
+        await self._ensure_stop_event().wait()
+
+    async def _wait_stop_or(self, aw) -> bool:
+        """Wait until stop is requested or `aw` finishes. Returns True if stopped."""
+        stop_event = self._ensure_stop_event()
+        stop_task = asyncio.create_task(stop_event.wait())
+        other_task = asyncio.ensure_future(aw)
+        try:
+            await asyncio.wait({stop_task, other_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stop_task.cancel()
+            other_task.cancel()
+            # Reap the loser so its cancellation/exception is retrieved, not warned about at shutdown;
+            # a cancellation of this task itself still propagates out of the gather
+            await asyncio.gather(stop_task, other_task, return_exceptions=True)
+        return stop_event.is_set()
 
     @abstractmethod
     async def run(self) -> None:
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import asyncio
+
+# Bytes read per relay iteration; large enough to keep syscall counts low on bulk transfers
+RELAY_CHUNK_SIZE = 65536
+
+# Transport write buffer limits for relayed connections: queue up to 256 KiB
+# before applying backpressure, resume the reader once it drains to 64 KiB
+WRITE_HIGH_WATER = 256 * 1024
+WRITE_LOW_WATER = 64 * 1024
+
+
+def set_relay_buffer_limits(*writers: asyncio.StreamWriter) -> None:
+    """Apply the relay write buffer limits to each writer's transport."""
+    for writer in writers:
+        writer.transport.set_write_buffer_limits(high=WRITE_HIGH_WATER, low=WRITE_LOW_WATER)
+
+
+async def write_relayed(writer: asyncio.StreamWriter, data: bytes) -> None:
+    """Write data, only awaiting drain() once the buffer passes the high-water mark."""
+    writer.write(data)
+    if writer.transport.get_write_buffer_size() > WRITE_HIGH_WATER:
+        await writer.drain()
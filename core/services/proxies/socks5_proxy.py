@@ -1,18 +1,81 @@
 import asyncio
+import contextlib
 import logging
+import re
+import socket
 import struct
 import subprocess
 import sys
+from collections import deque
 
 from .proxy import ProxyBase
+from .relay import RELAY_CHUNK_SIZE, set_relay_buffer_limits, write_relayed
+from .splice_relay import splice_relay
 
 logger = logging.getLogger(__name__)
 
+
+# Wire formats, compiled once: greeting header, request header, port
+_HS = struct.Struct('!BB')
+_REQ = struct.Struct('!BBBB')
+_PORT = struct.Struct('!H')
+
+# Keep the ssh subprocess from opening a console window on Windows
+if sys.platform == 'win32':
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    _STARTUPINFO.wShowWindow = subprocess.SW_HIDE
+    _CREATIONFLAGS = subprocess.CREATE_NO_WINDOW
+else:
+    _STARTUPINFO = None
+    _CREATIONFLAGS = 0
+
+# Replies to a CONNECT request (bound address reported as 0.0.0.0:0)
+_SUCCESS_REPLY = b'\x05\x00\x00\x01\x00\x00\x00\x00\x00\x00'
+_CONN_REFUSED = b'\x05\x05\x00\x01\x00\x00\x00\x00\x00\x00'
+_CMD_NOT_SUPPORTED = b'\x05\x07\x00\x01\x00\x00\x00\x00\x00\x00'
+_ATYP_NOT_SUPPORTED = b'\x05\x08\x00\x01\x00\x00\x00\x00\x00\x00'
+
+# Known ssh failure messages, matched in a single pass over the captured stderr
+_SSH_ERR_RE = re.compile(r'Permission denied|publickey|Connection refused|No route to host|Connection timed out')
+_SSH_ERR_KINDS = {
+    'Permission denied': 'auth',
+    'publickey': 'auth',
+    'Connection refused': 'refused',
+    'No route to host': 'unreachable',
+    'Connection timed out': 'unreachable',
+}
+
+# Lines of ssh stderr kept for classifying failures
+_STDERR_TAIL_LINES = 32
+
+# Kernel-level dead peer detection: probe after 60s idle, every 10s, give up after 3,
+# and drop connections whose sent data stays unacknowledged for 30s
+_KEEPALIVE_OPTS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+for _opt, _value in (('TCP_KEEPIDLE', 60), ('TCP_KEEPINTVL', 10), ('TCP_KEEPCNT', 3), ('TCP_USER_TIMEOUT', 30000)):
+    # Not every platform has all of these (TCP_USER_TIMEOUT is Linux-only)
+    if hasattr(socket, _opt):
+        _KEEPALIVE_OPTS.append((socket.IPPROTO_TCP, getattr(socket, _opt), _value))
+
+
+def _tune_socket(writer: asyncio.StreamWriter) -> None:
+    """Disable Nagle and enable TCP keepalive on a relayed connection."""
+    sock = writer.get_extra_info('socket')
+    if sock is None:
+        return
+    with contextlib.suppress(OSError):
+        # Small relayed writes shouldn't be held back waiting for ACKs
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        for level, opt, value in _KEEPALIVE_OPTS:
+            sock.setsockopt(level, opt, value)
+
 class Socks5Proxy(ProxyBase):
     def __init__(self, config):
         super().__init__(config)
         self._server = None
         self._ssh_process = None
+        self._stderr_task: asyncio.Task | None = None
+        self._stderr_lines: deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
 
     async def run(self) -> None:
         # If SSH username is provided, use SSH tunnel
@@ -31,6 +94,7 @@ class Socks5Proxy(ProxyBase):
             # -o BatchMode=yes prevents password prompts
             # -o ConnectTimeout=10 sets connection timeout
             # -o ServerAliveInterval=60 keeps connection alive
+            # -o ExitOnForwardFailure=yes exits if the -D port can't be bound
             ssh_cmd = [
                 'ssh',
                 '-D', f'127.0.0.1:{self.config.bind_port}',
@@ -40,6 +104,7 @@ class Socks5Proxy(ProxyBase):
                 '-o', 'ConnectTimeout=10',
                 '-o', 'ServerAliveInterval=60',
                 '-o', 'ServerAliveCountMax=3',
+                '-o', 'ExitOnForwardFailure=yes',
                 f'{self.config.ssh_username}@{self.config.listen_address}',
                 '-p', str(self.config.listen_port)
             ]
@@ -47,78 +112,70 @@ class Socks5Proxy(ProxyBase):
             logger.info(f"Starting SSH tunnel to {self.config.ssh_username}@{self.config.listen_address}:{self.config.listen_port}")
             
             # Start SSH process in background (no window on Windows)
-            startupinfo = None
-            creationflags = 0
-            if sys.platform == 'win32':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = subprocess.SW_HIDE
-                creationflags = subprocess.CREATE_NO_WINDOW
-            
             self._ssh_process = await asyncio.create_subprocess_exec(
                 *ssh_cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                startupinfo=startupinfo,
-                creationflags=creationflags
+                startupinfo=_STARTUPINFO,
+                creationflags=_CREATIONFLAGS
             )
+            # Drain stderr as it arrives, keeping only the tail for error reports
+            self._stderr_lines.clear()
+            self._stderr_task = asyncio.create_task(self._collect_stderr())
             
             # Wait for SSH to establish connection (or fail)
             logger.info("Waiting for SSH connection to establish...")
-            connection_established = False
+            exit_task = asyncio.create_task(self._ssh_process.wait())
+            ready_task = asyncio.create_task(self._probe_port_with_backoff())
+            done = set()
+            try:
+                done, _ = await asyncio.wait({exit_task, ready_task}, timeout=10, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                ready_task.cancel()
+                exit_task.cancel()
+                # Reap both so neither leaves an unretrieved exception behind
+                await asyncio.gather(exit_task, ready_task, return_exceptions=True)
             
-            for i in range(20):  # Wait up to 10 seconds
-                if self._ssh_process.returncode is not None:
-                    # Process already terminated - connection failed
-                    stderr = await self._ssh_process.stderr.read()
-                    error_msg = stderr.decode('utf-8', errors='ignore').strip()
-                    
-                    if 'Permission denied' in error_msg or 'publickey' in error_msg:
-                        logger.error(f"SSH authentication failed - no valid SSH key found for {self.config.ssh_username}@{self.config.listen_address}")
-                        logger.error("Please set up SSH key authentication or check your SSH keys")
-                    elif 'Connection refused' in error_msg:
-                        logger.error(f"SSH connection refused by {self.config.listen_address}:{self.config.listen_port}")
-                    elif 'No route to host' in error_msg or 'Connection timed out' in error_msg:
-                        logger.error(f"Cannot reach SSH server at {self.config.listen_address}:{self.config.listen_port}")
-                    else:
-                        logger.error(f"SSH tunnel failed to start: {error_msg}")
-                    raise RuntimeError(f"SSH connection failed: {error_msg}")
+            if self._ssh_process.returncode is not None:
+                # Process already terminated - connection failed
+                error_msg = await self._ssh_error_output()
                 
-                # Check if port is listening (simple check)
-                try:
-                    test_reader, test_writer = await asyncio.wait_for(
-                        asyncio.open_connection('127.0.0.1', self.config.bind_port),
-                        timeout=0.1
-                    )
-                    test_writer.close()
-                    await test_writer.wait_closed()
-                    connection_established = True
-                    break
-                except:
-                    pass
-                
-                await asyncio.sleep(0.5)
+                match = _SSH_ERR_RE.search(error_msg)
+                kind = _SSH_ERR_KINDS[match.group(0)] if match else None
+                if kind == 'auth':
+                    logger.error(f"SSH authentication failed - no valid SSH key found for {self.config.ssh_username}@{self.config.listen_address}")
+                    logger.error("Please set up SSH key authentication or check your SSH keys")
+                elif kind == 'refused':
+                    logger.error(f"SSH connection refused by {self.config.listen_address}:{self.config.listen_port}")
+                elif kind == 'unreachable':
+                    logger.error(f"Cannot reach SSH server at {self.config.listen_address}:{self.config.listen_port}")
+                else:
+                    logger.error(f"SSH tunnel failed to start: {error_msg}")
+                raise RuntimeError(f"SSH connection failed: {error_msg}")
+            
+            connection_established = ready_task in done
             
             if not connection_established:
                 logger.warning("SSH tunnel started but port not yet accessible (may still be connecting)")
             else:
                 logger.info(f"SOCKS5 proxy via SSH tunnel listening on 127.0.0.1:{self.config.bind_port}")
             
-            # Monitor SSH process with regular health checks
-            while not self._stop_event.is_set():
-                try:
-                    await asyncio.wait_for(self._stop_event.wait(), timeout=2.0)
-                except asyncio.TimeoutError:
-                    # Check if SSH process is still alive
-                    if self._ssh_process.returncode is not None:
-                        logger.error(f"SSH process terminated unexpectedly with code {self._ssh_process.returncode}")
-                        stderr = await self._ssh_process.stderr.read()
-                        if stderr:
-                            logger.error(f"SSH error: {stderr.decode('utf-8', errors='ignore')}")
-                        raise RuntimeError("SSH tunnel disconnected")
-                    continue
+            # Sleep until stopped or until the SSH process exits on its own
+            if not await self._wait_stop_or(self._ssh_process.wait()):
+                logger.error(f"SSH process terminated unexpectedly with code {self._ssh_process.returncode}")
+                error_msg = await self._ssh_error_output()
+                if error_msg:
+                    logger.error(f"SSH error: {error_msg}")
+                raise RuntimeError("SSH tunnel disconnected")
             
-            # Clean up
+            logger.info(f"SOCKS5 SSH tunnel stopped")
+        except Exception as e:
+            logger.error(f"SOCKS5 SSH tunnel error: {e}")
+            raise
+        finally:
+            if self._stderr_task:
+                self._stderr_task.cancel()
+            # Clean up (also on cancellation, so stop() never leaks the ssh process)
             if self._ssh_process and self._ssh_process.returncode is None:
                 self._ssh_process.terminate()
                 try:
@@ -126,11 +183,42 @@ class Socks5Proxy(ProxyBase):
                 except asyncio.TimeoutError:
                     self._ssh_process.kill()
                     await self._ssh_process.wait()
-            
-            logger.info(f"SOCKS5 SSH tunnel stopped")
-        except Exception as e:
-            logger.error(f"SOCKS5 SSH tunnel error: {e}")
-            raise
+
+    async def _collect_stderr(self) -> None:
+        """Read ssh's stderr line by line into the bounded tail buffer."""
+        stderr = self._ssh_process.stderr
+        while True:
+            try:
+                line = await stderr.readline()
+            except ValueError:
+                # Overlong line; the reader already discarded it
+                continue
+            if not line:
+                return
+            self._stderr_lines.append(line.decode('utf-8', errors='ignore').rstrip())
+
+    async def _probe_port_with_backoff(self) -> None:
+        """Return once the SSH -D port accepts connections, retrying with exponential backoff."""
+        loop = asyncio.get_running_loop()
+        delay = 0.05
+        while True:
+            # A bare socket is enough to see if ssh is listening; no streams needed
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.setblocking(False)
+                try:
+                    async with asyncio.timeout(0.1):
+                        await loop.sock_connect(sock, ('127.0.0.1', self.config.bind_port))
+                    return
+                except (OSError, TimeoutError):
+                    pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    async def _ssh_error_output(self) -> str:
+        """Return the captured stderr tail once ssh has exited."""
+        # ssh closes stderr when it exits; don't hang if a child process keeps it open
+        await asyncio.wait({self._stderr_task}, timeout=1.0)
+        return '\n'.join(self._stderr_lines).strip()
 
     async def _run_direct_proxy(self) -> None:
         """Run direct SOCKS5 proxy server (no SSH)."""
@@ -144,16 +232,10 @@ class Socks5Proxy(ProxyBase):
             logger.info(f"SOCKS5 proxy listening on 127.0.0.1:{self.config.bind_port}")
             
             async with self._server:
-                # Wait for stop event with periodic health checks
-                while not self._stop_event.is_set():
-                    try:
-                        await asyncio.wait_for(self._stop_event.wait(), timeout=5.0)
-                    except asyncio.TimeoutError:
-                        # Health check passed, continue
-                        if self._server is None or self._server.is_serving() == False:
-                            logger.error("Server stopped unexpectedly")
-                            raise RuntimeError("Server is no longer serving")
-                        continue
+                # Sleep until stopped; serve_forever only returns if the server dies
+                if not await self._wait_stop_or(self._server.serve_forever()):
+                    logger.error("Server stopped unexpectedly")
+                    raise RuntimeError("Server is no longer serving")
             
             logger.info(f"SOCKS5 proxy {self.config.listen_address}:{self.config.listen_port} stopped")
         except asyncio.CancelledError:
@@ -165,13 +247,12 @@ class Socks5Proxy(ProxyBase):
         finally:
             if self._server:
                 self._server.close()
-                try:
+                with contextlib.suppress(OSError):
                     await self._server.wait_closed()
-                except:
-                    pass
 
     async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle incoming SOCKS5 connections."""
+        remote_writer = None
         try:
             # Authentication handshake
             if not await self._handshake(reader, writer):
@@ -179,6 +260,8 @@ class Socks5Proxy(ProxyBase):
                 await writer.wait_closed()
                 return
             
+            _tune_socket(writer)
+            
             # Connection request
             target = await self._parse_request(reader, writer)
             if not target:
@@ -194,43 +277,47 @@ class Socks5Proxy(ProxyBase):
             except Exception as e:
                 logger.error(f"Failed to connect to {host}:{port}: {e}")
                 # Send connection refused
-                writer.write(b'\x05\x05\x00\x01\x00\x00\x00\x00\x00\x00')
+                writer.write(_CONN_REFUSED)
                 await writer.drain()
                 writer.close()
                 await writer.wait_closed()
                 return
+            _tune_socket(remote_writer)
             
             # Send success response
-            writer.write(b'\x05\x00\x00\x01\x00\x00\x00\x00\x00\x00')
+            writer.write(_SUCCESS_REPLY)
             await writer.drain()
             
-            # Relay data
-            await self._relay_data(reader, writer, remote_reader, remote_writer)
+            # Relay data, in kernel space when the platform allows it
+            if not await splice_relay(reader, writer, remote_reader, remote_writer):
+                await self._relay_data(reader, writer, remote_reader, remote_writer)
             
         except Exception as e:
             logger.error(f"Error handling SOCKS5 client: {e}")
         finally:
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except:
-                pass
+            # Both ends, whichever relay ran (or none, if the client went away first)
+            for w in (writer, remote_writer):
+                if w is None:
+                    continue
+                with contextlib.suppress(OSError):
+                    w.close()
+                    await w.wait_closed()
 
     async def _handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
         """Perform SOCKS5 handshake."""
         try:
             # Read version and number of methods
             data = await reader.readexactly(2)
-            version, nmethods = struct.unpack('!BB', data)
+            version, nmethods = _HS.unpack(data)
             
             if version != 5:
                 return False
             
-            # Read methods
+            # Read methods; readexactly returns without suspending when they are already buffered
             methods = await reader.readexactly(nmethods)
             
             # We support no authentication (0x00)
-            if 0 in methods:
+            if methods.find(b'\x00') >= 0:
                 writer.write(b'\x05\x00')  # Version 5, no auth
                 await writer.drain()
                 return True
@@ -248,35 +335,35 @@ class Socks5Proxy(ProxyBase):
         try:
             # Read request header
             data = await reader.readexactly(4)
-            version, cmd, _, atyp = struct.unpack('!BBBB', data)
+            version, cmd, _, atyp = _REQ.unpack(data)
             
             if version != 5:
                 return None
             
             if cmd != 1:  # Only CONNECT is supported
-                writer.write(b'\x05\x07\x00\x01\x00\x00\x00\x00\x00\x00')  # Command not supported
+                writer.write(_CMD_NOT_SUPPORTED)
                 await writer.drain()
                 return None
             
             # Parse destination address
             if atyp == 1:  # IPv4
                 addr_data = await reader.readexactly(4)
-                host = '.'.join(str(b) for b in addr_data)
+                host = socket.inet_ntop(socket.AF_INET, addr_data)
             elif atyp == 3:  # Domain name
                 addr_len = (await reader.readexactly(1))[0]
                 addr_data = await reader.readexactly(addr_len)
                 host = addr_data.decode('utf-8')
             elif atyp == 4:  # IPv6
                 addr_data = await reader.readexactly(16)
-                host = ':'.join(f'{addr_data[i]:02x}{addr_data[i+1]:02x}' for i in range(0, 16, 2))
+                host = socket.inet_ntop(socket.AF_INET6, addr_data)
             else:
-                writer.write(b'\x05\x08\x00\x01\x00\x00\x00\x00\x00\x00')  # Address type not supported
+                writer.write(_ATYP_NOT_SUPPORTED)
                 await writer.drain()
                 return None
             
             # Parse port
             port_data = await reader.readexactly(2)
-            port = struct.unpack('!H', port_data)[0]
+            port = _PORT.unpack(port_data)[0]
             
             return (host, port)
             
@@ -286,22 +373,21 @@ class Socks5Proxy(ProxyBase):
 
     async def _relay_data(self, client_reader, client_writer, remote_reader, remote_writer):
         """Relay data between client and remote server."""
+        set_relay_buffer_limits(client_writer, remote_writer)
+        
         async def forward(reader, writer):
             try:
                 while True:
-                    data = await reader.read(8192)
+                    data = await reader.read(RELAY_CHUNK_SIZE)
                     if not data:
                         break
-                    writer.write(data)
-                    await writer.drain()
-            except:
+                    await write_relayed(writer, data)
+            except (OSError, asyncio.IncompleteReadError):
                 pass
             finally:
-                try:
+                with contextlib.suppress(OSError):
                     writer.close()
                     await writer.wait_closed()
-                except:
-                    pass
         
         await asyncio.gather(
             forward(client_reader, remote_writer),
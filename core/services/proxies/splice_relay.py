@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import socket
+import sys
+
+from .relay import RELAY_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# os.splice moves bytes socket -> pipe -> socket without copying through Python
+SPLICE_SUPPORTED = sys.platform == "linux" and hasattr(os, "splice")
+
+_PIPE_CHUNK = 65536  # Default Linux pipe capacity
+
+
+def _can_splice(writer: asyncio.StreamWriter) -> bool:
+    if writer.get_extra_info("sslcontext") is not None:
+        return False
+    if writer.get_extra_info("socket") is None:
+        return False
+    # Anything still sitting in the transport's write buffer would be reordered
+    return writer.transport.get_write_buffer_size() == 0
+
+
+async def _take_buffered(reader: asyncio.StreamReader, transport: asyncio.Transport) -> bytes:
+    """Grab bytes the StreamReader already pulled off the socket."""
+    chunks = []
+    while True:
+        # read() may resume a reader that had paused itself on a full buffer
+        if transport.is_reading():
+            transport.pause_reading()
+        try:
+            # read() returns at once while bytes are buffered; with the transport paused an
+            # empty buffer would wait forever, which the zero timeout cuts short
+            async with asyncio.timeout(0):
+                data = await reader.read(RELAY_CHUNK_SIZE)
+        except TimeoutError:
+            break
+        if not data:
+            break
+        chunks.append(data)
+    return b"".join(chunks)
+
+
+def _shutdown(*socks: socket.socket) -> None:
+    for sock in socks:
+        with contextlib.suppress(OSError):
+            sock.shutdown(socket.SHUT_RDWR)
+
+
+async def _wait_fd(loop: asyncio.AbstractEventLoop, fd: int, writable: bool) -> None:
+    fut = loop.create_future()
+
+    def wake() -> None:
+        if not fut.done():
+            fut.set_result(None)
+
+    if writable:
+        loop.add_writer(fd, wake)
+    else:
+        loop.add_reader(fd, wake)
+    try:
+        await fut
+    finally:
+        if writable:
+            loop.remove_writer(fd)
+        else:
+            loop.remove_reader(fd)
+
+
+async def _splice_one_way(loop: asyncio.AbstractEventLoop, src: socket.socket, dst: socket.socket) -> None:
+    flags = os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK
+    src_fd, dst_fd = src.fileno(), dst.fileno()
+    pipe_r, pipe_w = os.pipe()
+    try:
+        while True:
+            try:
+                pending = os.splice(src_fd, pipe_w, _PIPE_CHUNK, flags=flags)
+            except BlockingIOError:
+                await _wait_fd(loop, src_fd, writable=False)
+                continue
+            if not pending:
+                break
+            while pending:
+                try:
+                    pending -= os.splice(pipe_r, dst_fd, pending, flags=flags)
+                except BlockingIOError:
+                    await _wait_fd(loop, dst_fd, writable=True)
+        dst.shutdown(socket.SHUT_WR)
+    except OSError as e:
+        # Reset or broken pipe: tear down both sockets so the opposite direction,
+        # parked in _wait_fd on the other peer, wakes up with EOF and ends too
+        logger.debug(f"Splice direction failed: {e}")
+        _shutdown(src, dst)
+    finally:
+        os.close(pipe_r)
+        os.close(pipe_w)
+
+
+async def splice_relay(
+    client_reader: asyncio.StreamReader,
+    client_writer: asyncio.StreamWriter,
+    remote_reader: asyncio.StreamReader,
+    remote_writer: asyncio.StreamWriter,
+) -> bool:
+    """
+    Relay both directions in kernel space using splice(2).
+
+    Returns False without touching the streams if zero-copy relaying is not
+    possible (non-Linux, TLS, pending writes); callers then fall back to the
+    regular read/write relay.
+    """
+    if not SPLICE_SUPPORTED:
+        return False
+    if not (_can_splice(client_writer) and _can_splice(remote_writer)):
+        return False
+
+    loop = asyncio.get_running_loop()
+
+    # Stop the transports from reading so the sockets are ours from here on
+    client_writer.transport.pause_reading()
+    remote_writer.transport.pause_reading()
+
+    # Duplicate the fds: the loop refuses add_reader() on fds owned by a transport
+    # (uvloop only hands out pseudo-sockets, so dup the raw fd rather than the object)
+    client_sock = socket.socket(fileno=os.dup(client_writer.get_extra_info("socket").fileno()))
+    remote_sock = socket.socket(fileno=os.dup(remote_writer.get_extra_info("socket").fileno()))
+    client_sock.setblocking(False)
+    remote_sock.setblocking(False)
+    try:
+        # Forward whatever the stream readers buffered before the switch
+        to_remote = await _take_buffered(client_reader, client_writer.transport)
+        to_client = await _take_buffered(remote_reader, remote_writer.transport)
+        if to_remote:
+            await loop.sock_sendall(remote_sock, to_remote)
+        if to_client:
+            await loop.sock_sendall(client_sock, to_client)
+
+        await asyncio.gather(
+            _splice_one_way(loop, client_sock, remote_sock),
+            _splice_one_way(loop, remote_sock, client_sock),
+        )
+    except OSError as e:
+        logger.debug(f"Splice relay ended: {e}")
+    finally:
+        client_sock.close()
+        remote_sock.close()
+        for writer in (client_writer, remote_writer):
+            writer.close()
+    return True
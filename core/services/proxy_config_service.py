@@ -1,6 +1,19 @@
 from __future__ import annotations
+import logging
+import threading
 from pathlib import Path
-from core.config.proxy_config_parser import SProxy2Config, ProxyConfig, load_config, save_config, validate_proxies
+from typing import Callable, Literal
+from core.config.proxy_config_parser import SProxy2Config, ProxyConfig, load_config, save_config, validate_one_against
+
+# What changed: a proxy was added or removed, or the whole config was reloaded
+ConfigChange = Literal["add", "remove", "reload"]
+ConfigListener = Callable[[ConfigChange, "str | None", "ProxyConfig | None"], None]
+SaveErrorListener = Callable[[OSError], None]
+
+logger = logging.getLogger(__name__)
+
+# Where the search for a free port suggestion starts (the SOCKS default)
+_FIRST_SUGGESTED_PORT = 1080
 
 
 class ConfigService:
@@ -9,6 +22,30 @@ class ConfigService:
     def __init__(self, config_path: Path):
         self.config_path = config_path
         self._config = load_config(config_path)
+        self._listeners: list[ConfigListener] = []
+        self._save_error_listeners: list[SaveErrorListener] = []
+        self._next_free_port: int | None = None  # Computed lazily, reset when it may be stale
+        
+        # Writes happen on a background thread; only the newest pending snapshot is kept
+        self._save_cond = threading.Condition()
+        self._pending_save: SProxy2Config | None = None
+        self._saving = False
+        self._save_thread: threading.Thread | None = None
+    
+    def add_change_listener(self, callback: ConfigListener) -> None:
+        """Register a callback run as `callback(op, name, proxy_config)` after every change."""
+        self._listeners.append(callback)
+    
+    def add_save_error_listener(self, callback: SaveErrorListener) -> None:
+        """Register a callback run as `callback(error)` when a queued write fails.
+        
+        Called on the config writer thread; GUI code must hand it over to its own thread.
+        """
+        self._save_error_listeners.append(callback)
+    
+    def _notify(self, op: ConfigChange, name: str | None = None, proxy: ProxyConfig | None = None) -> None:
+        for callback in self._listeners:
+            callback(op, name, proxy)
     
     @property
     def config(self) -> SProxy2Config:
@@ -39,29 +76,119 @@ class ConfigService:
             ssh_username=ssh_username,
         )
         
-        # Update in-memory config (immutable, so create new dict)
-        updated_proxies = dict(self._config.proxies)
-        updated_proxies[name] = new_proxy
-        
-        # Validate for duplicate endpoints using shared validation
-        validate_proxies(updated_proxies)
+        # Validate for duplicate endpoints before building anything
+        validate_one_against(self._config.proxies, name, new_proxy)
         
-        self._config = SProxy2Config(proxies=updated_proxies)
+        # Update in-memory config (immutable, so create new dict)
+        self._config = SProxy2Config(proxies={**self._config.proxies, name: new_proxy})
+        if new_proxy.listen_port == self._next_free_port:
+            self._next_free_port = None
         
         # Persist to disk
-        save_config(self.config_path, self._config)
+        self._schedule_save()
+        self._notify("add", name, new_proxy)
     
     def remove_proxy(self, name: str) -> None:
         """Remove a proxy and persist to disk."""
         if name not in self._config.proxies:
             raise KeyError(f"Proxy '{name}' not found")
         
-        updated_proxies = dict(self._config.proxies)
-        del updated_proxies[name]
-        self._config = SProxy2Config(proxies=updated_proxies)
+        self._config = SProxy2Config(
+            proxies={k: v for k, v in self._config.proxies.items() if k != name}
+        )
+        self._next_free_port = None
         
-        save_config(self.config_path, self._config)
+        self._schedule_save()
+        self._notify("remove", name)
+    
+    def update_proxy(
+        self,
+        old_name: str,
+        new_name: str,
+        listen_address: str,
+        listen_port: int,
+        bind_port: int,
+        proxy_type: str = "socks5",
+        run_on_startup: bool = False,
+        ssh_username: str | None = None,
+    ) -> None:
+        """Replace (and optionally rename) a proxy, persisting with a single write."""
+        proxies = self._config.proxies
+        if old_name not in proxies:
+            raise KeyError(f"Proxy '{old_name}' not found")
+        if new_name != old_name and new_name in proxies:
+            raise ValueError(f"Proxy name '{new_name}' already exists")
+        
+        new_proxy = ProxyConfig(
+            listen_address=listen_address,
+            listen_port=listen_port,
+            bind_port=bind_port,
+            proxy_type=proxy_type,
+            run_on_startup=run_on_startup,
+            ssh_username=ssh_username,
+        )
+        
+        # Validate against every other proxy; nothing changes if this fails
+        others = {k: v for k, v in proxies.items() if k != old_name}
+        validate_one_against(others, new_name, new_proxy)
+        
+        # Keep the entry at its original position in the file
+        self._config = SProxy2Config(proxies={
+            (new_name if k == old_name else k): (new_proxy if k == old_name else v)
+            for k, v in proxies.items()
+        })
+        self._next_free_port = None
+        
+        self._schedule_save()
+        self._notify("remove", old_name)
+        self._notify("add", new_name, new_proxy)
+    
+    def next_free_port(self) -> int:
+        """First listen port from 1080 upwards that no proxy uses yet."""
+        if self._next_free_port is None:
+            used_ports = {proxy.listen_port for proxy in self._config.proxies.values()}
+            self._next_free_port = next(
+                (port for port in range(_FIRST_SUGGESTED_PORT, 65535) if port not in used_ports),
+                65535,
+            )
+        return self._next_free_port
+    
+    def _schedule_save(self) -> None:
+        """Queue the current config for writing without blocking the caller."""
+        with self._save_cond:
+            # A burst of changes collapses into a single write of the latest config
+            self._pending_save = self._config
+            if self._save_thread is None:
+                self._save_thread = threading.Thread(target=self._save_worker, name="config-writer", daemon=True)
+                self._save_thread.start()
+            self._save_cond.notify_all()
+    
+    def _save_worker(self) -> None:
+        while True:
+            with self._save_cond:
+                while self._pending_save is None:
+                    self._save_cond.wait()
+                config, self._pending_save = self._pending_save, None
+                self._saving = True
+            try:
+                save_config(self.config_path, config)
+            except OSError as e:
+                logger.error(f"Failed to save config to {self.config_path}: {e}")
+                for callback in self._save_error_listeners:
+                    callback(e)
+            finally:
+                with self._save_cond:
+                    self._saving = False
+                    self._save_cond.notify_all()
+    
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until queued config writes have reached disk."""
+        with self._save_cond:
+            self._save_cond.wait_for(lambda: self._pending_save is None and not self._saving, timeout)
     
     def reload_from_disk(self) -> None:
         """Reload config from disk (useful if externally modified)."""
+        self.flush()
         self._config = load_config(self.config_path)
+        self._next_free_port = None
+        self._notify("reload")
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import logging
-from typing import Dict
+from typing import Callable, Dict
 
 from core.config.proxy_config_parser import ProxyConfig
 from core.services.proxies import create_proxy, ProxyBase
@@ -10,6 +11,9 @@ from core.services.proxies import create_proxy, ProxyBase
 
 logger = logging.getLogger(__name__)
 
+# How long a caller waits for the proxy event loop before giving up
+_CALL_TIMEOUT = 5.0
+
 
 class ProxyRunnerService:
     """Manages the lifecycle of running proxy instances."""
@@ -17,74 +21,109 @@ class ProxyRunnerService:
     def __init__(self):
         self._running_proxies: Dict[str, ProxyBase] = {}
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._listeners: list[Callable[[], None]] = []
+        # Names of running proxies, republished on every change so any thread can read it without the loop
+        self._running_snapshot: frozenset[str] = frozenset()
 
     def set_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         """Set the event loop to use for proxy tasks."""
         self._loop = loop
 
+    def add_change_listener(self, callback: Callable[[], None]) -> None:
+        """Register a callback run whenever the set of running proxies changes.
+
+        Callbacks are invoked on the event loop thread, so they should only
+        record the change (e.g. set a dirty flag) rather than touch the UI.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self) -> None:
+        self._running_snapshot = frozenset(self._running_proxies)
+        for callback in self._listeners:
+            callback()
+
+    def _on_proxy_done(self, name: str, proxy: ProxyBase) -> None:
+        # A proxy that crashed or was stopped is no longer running
+        if self._running_proxies.get(name) is proxy:
+            del self._running_proxies[name]
+        self._notify()
+
+    def _call(self, coro, timeout: float = _CALL_TIMEOUT):
+        """Run `coro` on the proxy event loop and block until it returns, at most `timeout` seconds."""
+        if not self._loop:
+            coro.close()
+            raise RuntimeError("Event loop not set. Call set_event_loop() first.")
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Proxy event loop did not respond within {timeout}s") from None
+
+    # _running_proxies is only ever touched on the loop thread; start/stop go
+    # through _call, and the status queries read the published snapshot.
+
     def start_proxy(self, name: str, config: ProxyConfig) -> None:
         """Start a proxy instance."""
+        self._call(self._start_impl(name, config))
+
+    async def _start_impl(self, name: str, config: ProxyConfig) -> None:
         if name in self._running_proxies:
             logger.warning(f"Proxy '{name}' is already running")
             return
 
-        if not self._loop:
-            raise RuntimeError("Event loop not set. Call set_event_loop() first.")
-
         try:
             proxy = create_proxy(config)
             self._running_proxies[name] = proxy
-
-            # Schedule the start coroutine
-            asyncio.run_coroutine_threadsafe(proxy.start(), self._loop)
+            await proxy.start()
+            proxy._task.add_done_callback(lambda _: self._on_proxy_done(name, proxy))
             logger.info(f"Started proxy '{name}'")
         except Exception as e:
             logger.error(f"Failed to start proxy '{name}': {e}")
-            if name in self._running_proxies:
-                del self._running_proxies[name]
+            self._running_proxies.pop(name, None)
             raise
+        finally:
+            self._notify()
 
     def stop_proxy(self, name: str) -> None:
         """Stop a proxy instance."""
-        proxy = self._running_proxies.get(name)
+        self._call(self._stop_impl(name))
+
+    async def _stop_impl(self, name: str) -> None:
+        # Remove from running proxies immediately to update status
+        proxy = self._running_proxies.pop(name, None)
         if not proxy:
             logger.warning(f"Proxy '{name}' is not running")
             return
 
+        # Don't wait for shutdown here; the task winds down on the loop by itself
+        proxy.request_stop()
+        self._notify()
+        logger.info(f"Stopped proxy '{name}'")
+
+    def stop_all(self, timeout: float = 5.0) -> None:
+        """Stop all running proxies, cancelling them together and waiting up to `timeout`."""
         if not self._loop:
-            raise RuntimeError("Event loop not set")
+            return
 
+        future = asyncio.run_coroutine_threadsafe(self._stop_all(), self._loop)
         try:
-            asyncio.run_coroutine_threadsafe(proxy.stop(), self._loop)
-            # Remove from running proxies immediately to update status
-            if name in self._running_proxies:
-                del self._running_proxies[name]
-            logger.info(f"Stopped proxy '{name}'")
+            future.result(timeout)
         except Exception as e:
-            logger.error(f"Failed to stop proxy '{name}': {e}")
-            # Still remove from running proxies if stop fails
-            if name in self._running_proxies:
-                del self._running_proxies[name]
-            raise
+            logger.error(f"Failed to stop all proxies: {e}")
+
+    async def _stop_all(self) -> None:
+        proxies = list(self._running_proxies.values())
+        self._running_proxies.clear()
+        self._notify()
+        for proxy in proxies:
+            proxy.request_stop()
+        await asyncio.gather(*(proxy.wait_task() for proxy in proxies), return_exceptions=True)
 
     def is_proxy_running(self, name: str) -> bool:
-        """Check if a proxy is running."""
-        proxy = self._running_proxies.get(name)
-        if not proxy:
-            return False
-        
-        # Check both the flag and if the task is still alive
-        if not proxy.is_running:
-            return False
-        
-        # Verify the task hasn't crashed
-        if proxy._task and proxy._task.done():
-            # Task finished, remove from running proxies
-            del self._running_proxies[name]
-            return False
-        
-        return True
+        """Check if a proxy is running. Never blocks, so it is safe on the GUI thread."""
+        return name in self._running_snapshot
 
-    def get_running_proxies(self) -> list[str]:
-        """Get list of running proxy names."""
-        return list(self._running_proxies.keys())
+    def get_running_proxies(self) -> frozenset[str]:
+        """Get a snapshot of running proxy names. Never blocks, so it is safe on the GUI thread."""
+        return self._running_snapshot
@@ -2,18 +2,30 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from core.config.proxy_config_parser import ProxyConfig
-from core.services.proxy_config_service import ConfigService
+from core.services.proxy_config_service import ConfigChange, ConfigService
 
-@dataclass
-class Proxy(ProxyConfig):
+@dataclass(slots=True)
+class Proxy:
+    config: ProxyConfig
     is_running: bool = False
     process_id: int | None = None
     
     
 class ProxyStatusService:
     def __init__(self, config_service: ConfigService):
+        self._config_service = config_service
         self._proxies: dict[str, Proxy] = {}
         self._update_proxy_reference(config_service)
+        config_service.add_change_listener(self._on_config_change)
+    
+    def _on_config_change(self, op: ConfigChange, name: str | None, proxy_cfg: ProxyConfig | None) -> None:
+        """Apply a single add/remove instead of rescanning the whole config."""
+        if op == "add":
+            self._proxies[name] = Proxy(proxy_cfg)
+        elif op == "remove":
+            self._proxies.pop(name, None)
+        else:
+            self._update_proxy_reference(self._config_service)
     
     def _update_proxy_reference(self, config_service: ConfigService) -> None:
         """Sync internal proxy list with config service."""
@@ -22,13 +34,7 @@ class ProxyStatusService:
         # Add new proxies
         for name, proxy_cfg in current_proxies.items():
             if name not in self._proxies:
-                self._proxies[name] = Proxy(
-                    listen_address=proxy_cfg.listen_address,
-                    listen_port=proxy_cfg.listen_port,
-                    bind_port=proxy_cfg.bind_port,
-                    proxy_type=proxy_cfg.proxy_type,
-                    run_on_startup=proxy_cfg.run_on_startup,
-                )
+                self._proxies[name] = Proxy(proxy_cfg)
         
         # Remove deleted proxies
         for name in list(self._proxies.keys()):
@@ -42,4 +48,4 @@ class ProxyStatusService:
         proxy = self._proxies.get(name)
         if proxy:
             proxy.is_running = True
-            proxy.process_id = process_id
\ No newline at end of file
+            proxy.process_id = process_id
@@ -0,0 +1,25 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PySide6.QtWidgets import QApplication, QWidget
+
+    from frontend.icons import LazyIcon
+    from frontend.tray.tray_app import TrayApp
+    from core.services.proxy_config_service import ConfigService
+    from core.services.proxy_runner_service import ProxyRunnerService
+
+
+@dataclass(slots=True)
+class AppServices:
+    """Shared by the tray and the main window; built once in main()."""
+    app: QApplication
+    icon: LazyIcon
+    config_service: ConfigService
+    proxy_runner: ProxyRunnerService | None = None
+    # Filled in by TrayApp and main() as those objects are created
+    tray_show_message: Callable[[str, str], None] | None = None
+    exit_service: Callable[[], None] | None = None
+    main_window: QWidget | None = None
+    tray: TrayApp | None = None  # Held here so the tray icon lives as long as the app
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from PySide6.QtGui import QIcon, QPixmap
+
+
+class LazyIcon:
+    """QIcon loaded from `path` on first get(), then reused."""
+
+    __slots__ = ("path", "_icon")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._icon: QIcon | None = None
+
+    def get(self) -> QIcon:
+        if self._icon is None:
+            # Decode the image once; every consumer shares this icon
+            pixmap = QPixmap(self.path)
+            icon = QIcon()
+            icon.addPixmap(pixmap, QIcon.Normal, QIcon.Off)
+            icon.addPixmap(pixmap, QIcon.Normal, QIcon.On)
+            self._icon = icon
+        return self._icon
@@ -16,7 +16,7 @@ def create_tray_actions(deps) -> dict[str, QAction]:
     # Hide main window to tray
     def hide_main_window():
         deps.main_window.hide()
-        if hasattr(deps, "tray_show_message"):
+        if deps.tray_show_message:
             deps.tray_show_message(
                 "SProxy2",
                 "Still running in the background. Use the tray menu to quit.",
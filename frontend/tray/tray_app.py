@@ -1,32 +1,26 @@
 from __future__ import annotations
-from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
-from PySide6.QtWidgets import QSystemTrayIcon, QMenu, QApplication
-from PySide6.QtGui import QIcon, QAction
-from PySide6.QtCore import QObject
+from PySide6.QtWidgets import QSystemTrayIcon, QMenu
+from PySide6.QtGui import QAction
+from PySide6.QtCore import QObject, Slot
 
-from core.services.proxy_config_service import ConfigService
 from .menu_builder import build_tray_menu
 from .actions import create_tray_actions
 
 if TYPE_CHECKING:
-    from core.services.proxy_runner_service import ProxyRunnerService
-
-@dataclass
-class TrayDependencies:
-    app: QApplication
-    icon: QIcon
-    main_window: QObject
-    config_service: ConfigService
-    proxy_runner: ProxyRunnerService | None = None
+    from core.config.proxy_config_parser import ProxyConfig
+    from frontend.app_services import AppServices
     
 class TrayApp(QObject):
-    def __init__(self, deps: TrayDependencies):
+    def __init__(self, deps: AppServices):
         super().__init__()
         self.deps = deps
+        # Publish the tray callbacks the main window uses
+        deps.tray_show_message = self.show_message
+        deps.exit_service = self.exit_app
         
-        self.tray = QSystemTrayIcon(deps.icon, self)
+        self.tray = QSystemTrayIcon(deps.icon.get(), self)  # The tray is visible right away
         self.tray.setToolTip("SProxy2")
         
         self.actions = create_tray_actions(deps)
@@ -34,56 +28,76 @@ class TrayApp(QObject):
         self.menu = build_tray_menu(self.actions)
         self.tray.setContextMenu(self.menu)
         
-        # Rebuild menu when shown to reflect current proxy list
+        # Rebuild menu when shown, but only if proxies or their status changed since
+        self._menu_dirty = True
+        self._proxy_actions: dict[str, QAction] = {}
+        self._action_states: dict[str, tuple[ProxyConfig, bool]] = {}
+        self._no_proxies_action: QAction | None = None
+        deps.config_service.add_change_listener(self._mark_menu_dirty)
+        if deps.proxy_runner:
+            deps.proxy_runner.add_change_listener(self._mark_menu_dirty)
         self.tray.activated.connect(self._on_tray_activated)
         
         self.tray.show()
     
+    def _mark_menu_dirty(self, *_) -> None:
+        # May be called from the proxy event loop thread; only flip the flag here
+        self._menu_dirty = True
+    
+    @Slot(QSystemTrayIcon.ActivationReason)
     def _on_tray_activated(self, reason) -> None:
         """Rebuild menu when tray icon is interacted with."""
-        if reason == QSystemTrayIcon.Context:
+        if reason == QSystemTrayIcon.Context and self._menu_dirty:
+            self._menu_dirty = False
             self._rebuild_menu()
     
+    def _proxy_action(self, name: str, proxy: ProxyConfig, is_running: bool) -> QAction:
+        """Return the pooled menu entry for a proxy, relabelled only if its state changed."""
+        action = self._proxy_actions.get(name)
+        if action is None:
+            action = QAction(self)
+            action.setEnabled(False)
+            self._proxy_actions[name] = action
+        state = (proxy, is_running)
+        if self._action_states.get(name) != state:
+            self._action_states[name] = state
+            status = "RUNNING" if is_running else "STOPPED"
+            action.setText(f"[{status}] {name}\n  {proxy.listen_address}:{proxy.listen_port}")
+        return action
+    
     def _rebuild_menu(self) -> None:
         """Rebuild the tray menu with current proxy list sorted by running status."""
         self.menu.clear()
         
         # Get proxies and sort by running status
         proxies = self.deps.config_service.config.proxies
+        
+        # Drop entries for proxies that no longer exist
+        for name in self._proxy_actions.keys() - proxies.keys():
+            self._proxy_actions.pop(name).deleteLater()
+            self._action_states.pop(name, None)
+        
         if proxies:
-            running_proxies = []
-            stopped_proxies = []
+            running = self.deps.proxy_runner.get_running_proxies() if self.deps.proxy_runner else frozenset()
+            running_actions = []
+            stopped_actions = []
             
             for name, proxy in proxies.items():
-                is_running = self.deps.proxy_runner and self.deps.proxy_runner.is_proxy_running(name)
-                proxy_info = (name, proxy, is_running)
-                
+                is_running = name in running
+                action = self._proxy_action(name, proxy, is_running)
                 if is_running:
-                    running_proxies.append(proxy_info)
+                    running_actions.append(action)
                 else:
-                    stopped_proxies.append(proxy_info)
-            
-            # Add running proxies first
-            for name, proxy, _ in running_proxies:
-                proxy_action = QAction(
-                    f"[RUNNING] {name}\n  {proxy.listen_address}:{proxy.listen_port}",
-                    self
-                )
-                proxy_action.setEnabled(False)
-                self.menu.addAction(proxy_action)
+                    stopped_actions.append(action)
             
-            # Add stopped proxies
-            for name, proxy, _ in stopped_proxies:
-                proxy_action = QAction(
-                    f"[STOPPED] {name}\n  {proxy.listen_address}:{proxy.listen_port}",
-                    self
-                )
-                proxy_action.setEnabled(False)
-                self.menu.addAction(proxy_action)
+            # Running proxies first, then stopped ones
+            self.menu.addActions(running_actions)
+            self.menu.addActions(stopped_actions)
         else:
-            no_proxies = QAction("No proxies configured", self)
-            no_proxies.setEnabled(False)
-            self.menu.addAction(no_proxies)
+            if self._no_proxies_action is None:
+                self._no_proxies_action = QAction("No proxies configured", self)
+                self._no_proxies_action.setEnabled(False)
+            self.menu.addAction(self._no_proxies_action)
         
         self.menu.addSeparator()
         self.menu.addAction(self.actions["show"])
@@ -1,13 +1,18 @@
 from __future__ import annotations
+from dataclasses import dataclass
 from enum import Enum
-from typing import Callable, TYPE_CHECKING
+from typing import Callable, Mapping, TYPE_CHECKING
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QListView, QStyledItemDelegate, QStyle, QStyleOptionButton, QStyleOptionFocusRect, QApplication
+)
+from PySide6.QtCore import Qt, Signal, Slot, QAbstractListModel, QModelIndex, QRect, QSize, QEvent
+from PySide6.QtGui import QColor, QFont
 
 from core.services.proxy_config_service import ConfigService
 
 if TYPE_CHECKING:
+    from core.config.proxy_config_parser import ProxyConfig
     from core.services.proxy_runner_service import ProxyRunnerService
 
 
@@ -18,140 +23,302 @@ class ProxyStatus(Enum):
     ERROR = "Error"
 
 
-class ProxyListItem(QFrame):
-    """Individual proxy item showing name, endpoint, and status."""
-    
+@dataclass(slots=True)
+class _ProxyRow:
+    name: str
+    endpoint: str
+    status: ProxyStatus = ProxyStatus.STOPPED
+
+
+class ProxyListModel(QAbstractListModel):
+    """One row per configured proxy: name, endpoint and status."""
+
+    NameRole = Qt.UserRole + 1
+    EndpointRole = Qt.UserRole + 2
+    StatusRole = Qt.UserRole + 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: list[_ProxyRow] = []
+        self._positions: dict[str, int] = {}  # Proxy name -> row
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole or role == self.NameRole:
+            return row.name
+        if role == self.EndpointRole:
+            return row.endpoint
+        if role == self.StatusRole:
+            return row.status
+        return None
+
+    def _reindex(self) -> None:
+        self._positions = {row.name: i for i, row in enumerate(self._rows)}
+
+    def _insert_rows(self, first: int, rows: list[_ProxyRow]) -> None:
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows[first:first] = rows
+        self.endInsertRows()
+        self._reindex()
+
+    def sync(self, proxies: Mapping[str, ProxyConfig], is_running: Callable[[str], bool]) -> None:
+        """Bring rows in line with `proxies` (including their order), only touching rows that changed."""
+        # Remove rows for proxies that no longer exist (back to front keeps indices valid)
+        for i in range(len(self._rows) - 1, -1, -1):
+            if self._rows[i].name not in proxies:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self._rows[i]
+                self.endRemoveRows()
+        self._reindex()
+
+        # Rows before `target` already match the config; new proxies are inserted in runs
+        new_rows: list[_ProxyRow] = []
+        for target, (name, proxy) in enumerate(proxies.items()):
+            endpoint = f"{proxy.listen_address}:{proxy.listen_port}"
+            i = self._positions.get(name)
+            if i is None:
+                # Restore running status for proxies started elsewhere (e.g. on startup)
+                status = ProxyStatus.RUNNING if is_running(name) else ProxyStatus.STOPPED
+                new_rows.append(_ProxyRow(name, endpoint, status))
+                continue
+            if new_rows:
+                self._insert_rows(target - len(new_rows), new_rows)
+                new_rows = []
+                i = self._positions[name]
+            if i != target:
+                # Renamed or re-added proxies move to their config position
+                self.beginMoveRows(QModelIndex(), i, i, QModelIndex(), target)
+                self._rows.insert(target, self._rows.pop(i))
+                self.endMoveRows()
+                self._reindex()
+            if self._rows[target].endpoint != endpoint:
+                self._rows[target].endpoint = endpoint
+                index = self.index(target)
+                self.dataChanged.emit(index, index, [self.EndpointRole])
+
+        if new_rows:
+            self._insert_rows(len(self._rows), new_rows)
+
+    def set_status(self, name: str, status: ProxyStatus) -> None:
+        i = self._positions.get(name)
+        # Unknown proxy or no actual transition: nothing to repaint
+        if i is None or self._rows[i].status is status:
+            return
+        self._rows[i].status = status
+        index = self.index(i)
+        self.dataChanged.emit(index, index, [self.StatusRole])
+
+
+class ProxyItemDelegate(QStyledItemDelegate):
+    """Paints a proxy row (name, endpoint, status, Start/Stop/Edit) and handles button clicks and keys."""
+
     start_clicked = Signal(str)  # Emits proxy name
     stop_clicked = Signal(str)   # Emits proxy name
     edit_clicked = Signal(str)   # Emits proxy name
-    
-    def __init__(self, name: str, listen_address: str, listen_port: int, parent=None):
-        super().__init__(parent)
-        self.proxy_name = name
-        self.status = ProxyStatus.STOPPED
-        
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setLineWidth(1)
-        
-        layout = QHBoxLayout(self)
-        
-        # Info section
-        info_layout = QVBoxLayout()
-        self.name_label = QLabel(f"<b>{name}</b>")
-        self.endpoint_label = QLabel(f"{listen_address}:{listen_port}")
-        self.endpoint_label.setStyleSheet("color: gray; font-size: 10px;")
-        info_layout.addWidget(self.name_label)
-        info_layout.addWidget(self.endpoint_label)
-        
-        layout.addLayout(info_layout, stretch=1)
-        
-        # Status label
-        self.status_label = QLabel("Stopped")
-        self.status_label.setAlignment(Qt.AlignCenter)
-        self.status_label.setMinimumWidth(80)
-        self._update_status_style()
-        layout.addWidget(self.status_label)
-        
+
+    _ROW_HEIGHT = 56
+    _MARGIN = 8
+    _SPACING = 6
+    _BUTTON_SIZE = QSize(64, 26)
+    _STATUS_WIDTH = 80
+    _BUTTON_LABELS = ("Start", "Stop", "Edit")
+    # Status -> (status color, (Start, Stop, Edit) enabled)
+    _STATE_TABLE = {
+        ProxyStatus.RUNNING: (QColor("green"), (False, True, True)),
+        ProxyStatus.ERROR: (QColor("red"), (True, False, True)),
+        ProxyStatus.STOPPED: (QColor("gray"), (True, False, True)),
+    }
+    _ENDPOINT_COLOR = QColor("gray")
+    _TOGGLE_KEYS = frozenset({Qt.Key_Space, Qt.Key_Select})
+    _EDIT_KEYS = frozenset({Qt.Key_Return, Qt.Key_Enter, Qt.Key_F2})
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), self._ROW_HEIGHT)
+
+    def _button_rects(self, rect: QRect) -> list[QRect]:
+        """Start, Stop and Edit button rectangles, right-aligned in the row."""
+        width, height = self._BUTTON_SIZE.width(), self._BUTTON_SIZE.height()
+        count = len(self._BUTTON_LABELS)
+        x = rect.right() - self._MARGIN - count * width - (count - 1) * self._SPACING
+        y = rect.center().y() - height // 2
+        return [QRect(x + i * (width + self._SPACING), y, width, height) for i in range(count)]
+
+    def paint(self, painter, option, index) -> None:
+        style = option.widget.style() if option.widget else QApplication.style()
+        status = index.data(ProxyListModel.StatusRole)
+        status_color, enabled_buttons = self._STATE_TABLE[status]
+        frame = option.rect.adjusted(2, 2, -2, -2)
+        buttons = self._button_rects(option.rect)
+
+        painter.save()
+
+        # Panel outline, like the StyledPanel frame each row used to have
+        painter.setPen(option.palette.mid().color())
+        painter.drawRect(frame.adjusted(0, 0, -1, -1))
+
+        # Name and endpoint on the left
+        text_rect = QRect(
+            frame.left() + self._MARGIN, frame.top(),
+            buttons[0].left() - self._SPACING - self._STATUS_WIDTH - frame.left() - 2 * self._MARGIN, frame.height(),
+        )
+        half = text_rect.height() // 2
+        top, bottom = text_rect.adjusted(0, 0, 0, -half), text_rect.adjusted(0, half, 0, 0)
+
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(option.palette.text().color())
+        painter.drawText(top, Qt.AlignLeft | Qt.AlignBottom, index.data(ProxyListModel.NameRole))
+
+        # Status, bold and colored
+        status_rect = QRect(buttons[0].left() - self._SPACING - self._STATUS_WIDTH, frame.top(), self._STATUS_WIDTH, frame.height())
+        painter.setPen(status_color)
+        painter.drawText(status_rect, Qt.AlignCenter, status.value)
+
+        font = QFont(option.font)
+        font.setPixelSize(10)
+        painter.setFont(font)
+        painter.setPen(self._ENDPOINT_COLOR)
+        painter.drawText(bottom, Qt.AlignLeft | Qt.AlignTop, index.data(ProxyListModel.EndpointRole))
+
+        painter.restore()
+
+        # Keyboard focus marker for the current row
+        if option.state & QStyle.State_HasFocus:
+            focus = QStyleOptionFocusRect()
+            focus.rect = frame.adjusted(1, 1, -1, -1)
+            focus.palette = option.palette
+            focus.state = option.state
+            style.drawPrimitive(QStyle.PE_FrameFocusRect, focus, painter, option.widget)
+
         # Control buttons
-        self.start_btn = QPushButton("Start")
-        self.start_btn.clicked.connect(lambda: self.start_clicked.emit(self.proxy_name))
-        layout.addWidget(self.start_btn)
-        
-        self.stop_btn = QPushButton("Stop")
-        self.stop_btn.clicked.connect(lambda: self.stop_clicked.emit(self.proxy_name))
-        self.stop_btn.setEnabled(False)
-        layout.addWidget(self.stop_btn)
-        
-        self.edit_btn = QPushButton("Edit")
-        self.edit_btn.clicked.connect(lambda: self.edit_clicked.emit(self.proxy_name))
-        layout.addWidget(self.edit_btn)
-    
-    def set_status(self, status: ProxyStatus) -> None:
-        """Update the status display."""
-        self.status = status
-        self.status_label.setText(status.value)
-        self._update_status_style()
-        
-        # Update button states
-        if status == ProxyStatus.RUNNING:
-            self.start_btn.setEnabled(False)
-            self.stop_btn.setEnabled(True)
-        else:
-            self.start_btn.setEnabled(True)
-            self.stop_btn.setEnabled(False)
-    
-    def _update_status_style(self) -> None:
-        """Update status label styling based on current status."""
-        if self.status == ProxyStatus.RUNNING:
-            color = "green"
-        elif self.status == ProxyStatus.ERROR:
-            color = "red"
+        for label, rect, enabled in zip(self._BUTTON_LABELS, buttons, enabled_buttons):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = label
+            button.palette = option.palette
+            button.state = QStyle.State_Raised | (QStyle.State_Enabled if enabled else QStyle.State_None)
+            style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def handle_key(self, key: int, index: QModelIndex) -> bool:
+        """Space starts or stops the row's proxy, Enter/F2 edits it. Returns True if handled."""
+        if not index.isValid():
+            return False
+        if key in self._TOGGLE_KEYS:
+            _, (start_enabled, _, _) = self._STATE_TABLE[index.data(ProxyListModel.StatusRole)]
+            signal = self.start_clicked if start_enabled else self.stop_clicked
+        elif key in self._EDIT_KEYS:
+            signal = self.edit_clicked
         else:
-            color = "gray"
-        
-        self.status_label.setStyleSheet(f"color: {color}; font-weight: bold;")
+            return False
+        signal.emit(index.data(ProxyListModel.NameRole))
+        return True
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            pos = event.position().toPoint()
+            _, enabled_buttons = self._STATE_TABLE[index.data(ProxyListModel.StatusRole)]
+            signals = (self.start_clicked, self.stop_clicked, self.edit_clicked)
+            for signal, rect, enabled in zip(signals, self._button_rects(option.rect), enabled_buttons):
+                if enabled and rect.contains(pos):
+                    signal.emit(index.data(ProxyListModel.NameRole))
+                    return True
+        elif event.type() == QEvent.KeyPress and self.handle_key(event.key(), index):
+            return True
+        return super().editorEvent(event, model, option, index)
 
 
 class ProxyListWidget(QWidget):
     """Reusable widget displaying all configured proxies."""
-    
+
     proxy_started = Signal(str)  # Emits proxy name
     proxy_stopped = Signal(str)  # Emits proxy name
     proxy_edited = Signal(str)   # Emits proxy name
-    
+
     def __init__(self, config_service: ConfigService, proxy_runner: ProxyRunnerService | None = None, parent=None):
         super().__init__(parent)
         self.config_service = config_service
         self.proxy_runner = proxy_runner
-        self.proxy_items: dict[str, ProxyListItem] = {}
-        
+
         self.layout = QVBoxLayout(self)
         self.layout.setAlignment(Qt.AlignTop)
-        
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+        # One view paints every row; no per-proxy widgets or layouts
+        self.model = ProxyListModel(self)
+        self.delegate = ProxyItemDelegate(self)
+        self.delegate.start_clicked.connect(self._on_start_proxy)
+        self.delegate.stop_clicked.connect(self._on_stop_proxy)
+        self.delegate.edit_clicked.connect(self._on_edit_proxy)
+
+        self.view = QListView(self)
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(self.delegate)
+        self.view.setUniformItemSizes(True)
+        self.view.setSelectionMode(QListView.NoSelection)
+        self.view.setFrameShape(QListView.NoFrame)
+        self.view.setFocusPolicy(Qt.StrongFocus)
+        # The view turns Enter into activated() instead of an editor event; route it to the delegate
+        self.view.installEventFilter(self)
+        self.layout.addWidget(self.view)
+
+        # Empty state, shown only while no proxies are configured
+        self._empty_label = QLabel("No proxies configured")
+        self._empty_label.setAlignment(Qt.AlignCenter)
+        self._empty_label.setObjectName("emptyProxyList")  # Styled by the app stylesheet
+        self.layout.addWidget(self._empty_label)
+
         self.refresh()
-    
+
+    def _is_running(self, name: str) -> bool:
+        return bool(self.proxy_runner and self.proxy_runner.is_proxy_running(name))
+
     def refresh(self) -> None:
-        """Refresh the proxy list from config."""
-        # Clear existing items
-        for item in self.proxy_items.values():
-            self.layout.removeWidget(item)
-            item.deleteLater()
-        self.proxy_items.clear()
-        
-        # Add current proxies
-        for name, proxy in self.config_service.config.proxies.items():
-            item = ProxyListItem(name, proxy.listen_address, proxy.listen_port, self)
-            item.start_clicked.connect(self._on_start_proxy)
-            item.stop_clicked.connect(self._on_stop_proxy)
-            item.edit_clicked.connect(self._on_edit_proxy)
-            
-            # Restore running status if proxy_runner is available
-            if self.proxy_runner and self.proxy_runner.is_proxy_running(name):
-                item.set_status(ProxyStatus.RUNNING)
-            
-            self.proxy_items[name] = item
-            self.layout.addWidget(item)
-        
-        # Add empty state if no proxies
-        if not self.proxy_items:
-            empty_label = QLabel("No proxies configured")
-            empty_label.setAlignment(Qt.AlignCenter)
-            empty_label.setStyleSheet("color: gray; padding: 20px;")
-            self.layout.addWidget(empty_label)
-    
+        """Sync the proxy list with config, touching only the rows that changed."""
+        # Row removals, inserts and the empty-state toggle land as one repaint and relayout
+        self.setUpdatesEnabled(False)
+        self.layout.setEnabled(False)
+        try:
+            self.model.sync(self.config_service.config.proxies, self._is_running)
+
+            empty = self.model.rowCount() == 0
+            self.view.setVisible(not empty)
+            self._empty_label.setVisible(empty)
+        finally:
+            self.layout.setEnabled(True)
+            self.setUpdatesEnabled(True)
+            self.layout.activate()
+
+    def eventFilter(self, watched, event) -> bool:
+        if (
+            watched is self.view
+            and event.type() == QEvent.KeyPress
+            and event.key() in (Qt.Key_Return, Qt.Key_Enter)
+            and self.delegate.handle_key(event.key(), self.view.currentIndex())
+        ):
+            return True
+        return super().eventFilter(watched, event)
+
     def set_proxy_status(self, name: str, status: ProxyStatus) -> None:
         """Update the status of a specific proxy."""
-        if name in self.proxy_items:
-            self.proxy_items[name].set_status(status)
-    
+        self.model.set_status(name, status)
+
+    @Slot(str)
     def _on_start_proxy(self, name: str) -> None:
         """Handle start button click."""
         self.proxy_started.emit(name)
-    
+
+    @Slot(str)
     def _on_stop_proxy(self, name: str) -> None:
         """Handle stop button click."""
         self.proxy_stopped.emit(name)
-    
+
+    @Slot(str)
     def _on_edit_proxy(self, name: str) -> None:
         """Handle edit button click."""
         self.proxy_edited.emit(name)
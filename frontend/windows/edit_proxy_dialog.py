@@ -1,7 +1,9 @@
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout,
-    QLineEdit, QSpinBox, QDialogButtonBox, QMessageBox, QComboBox, QCheckBox
+    QLineEdit, QDialogButtonBox, QMessageBox, QComboBox, QCheckBox
 )
+from PySide6.QtCore import Slot
+from PySide6.QtGui import QIntValidator
 from core.config.proxy_config_parser import ProxyConfig
 
 
@@ -13,39 +15,42 @@ class EditProxyDialog(QDialog):
         self.proxy_name = proxy_name
         self.original_config = proxy_config
 
+        self._build_ui()
+
+    def _build_ui(self) -> None:
         layout = QVBoxLayout(self)
         form = QFormLayout()
 
         self.name_edit = QLineEdit()
-        self.name_edit.setText(proxy_name)
+        self.name_edit.setText(self.proxy_name)
 
         self.listen_address_edit = QLineEdit()
-        self.listen_address_edit.setText(proxy_config.listen_address)
+        self.listen_address_edit.setText(self.original_config.listen_address)
 
-        self.listen_port_spin = QSpinBox()
-        self.listen_port_spin.setRange(1, 65535)
-        self.listen_port_spin.setValue(proxy_config.listen_port)
+        # Plain line edits restricted to valid ports; lighter than spin boxes
+        port_validator = QIntValidator(1, 65535, self)
+        self.listen_port_edit = QLineEdit(str(self.original_config.listen_port))
+        self.listen_port_edit.setValidator(port_validator)
 
-        self.bind_port_spin = QSpinBox()
-        self.bind_port_spin.setRange(1, 65535)
-        self.bind_port_spin.setValue(proxy_config.bind_port)
+        self.bind_port_edit = QLineEdit(str(self.original_config.bind_port))
+        self.bind_port_edit.setValidator(port_validator)
 
         self.proxy_type_combo = QComboBox()
         self.proxy_type_combo.addItems(["socks5", "http"])
-        self.proxy_type_combo.setCurrentText(proxy_config.proxy_type)
+        self.proxy_type_combo.setCurrentText(self.original_config.proxy_type)
 
         self.ssh_username_edit = QLineEdit()
-        if proxy_config.ssh_username:
-            self.ssh_username_edit.setText(proxy_config.ssh_username)
+        if self.original_config.ssh_username:
+            self.ssh_username_edit.setText(self.original_config.ssh_username)
         self.ssh_username_edit.setPlaceholderText("Optional: SSH username for SOCKS5")
 
         self.run_on_startup_check = QCheckBox()
-        self.run_on_startup_check.setChecked(proxy_config.run_on_startup)
+        self.run_on_startup_check.setChecked(self.original_config.run_on_startup)
 
         form.addRow("Name:", self.name_edit)
         form.addRow("Listen Address:", self.listen_address_edit)
-        form.addRow("SSH Port:", self.listen_port_spin)
-        form.addRow("Bind Port:", self.bind_port_spin)
+        form.addRow("SSH Port:", self.listen_port_edit)
+        form.addRow("Bind Port:", self.bind_port_edit)
         form.addRow("Proxy Type:", self.proxy_type_combo)
         form.addRow("SSH Username:", self.ssh_username_edit)
         form.addRow("Run on Startup:", self.run_on_startup_check)
@@ -57,6 +62,7 @@ class EditProxyDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
 
+    @Slot()
     def _on_accept(self) -> None:
         name = self.name_edit.text().strip()
         addr = self.listen_address_edit.text().strip()
@@ -67,6 +73,9 @@ class EditProxyDialog(QDialog):
         if not addr:
             QMessageBox.warning(self, "Invalid input", "Listen address is required.")
             return
+        if not (self.listen_port_edit.hasAcceptableInput() and self.bind_port_edit.hasAcceptableInput()):
+            QMessageBox.warning(self, "Invalid input", "Ports must be between 1 and 65535.")
+            return
 
         self.accept()
 
@@ -75,8 +84,8 @@ class EditProxyDialog(QDialog):
         return (
             self.name_edit.text().strip(),
             self.listen_address_edit.text().strip(),
-            self.listen_port_spin.value(),
-            self.bind_port_spin.value(),
+            int(self.listen_port_edit.text()),
+            int(self.bind_port_edit.text()),
             self.proxy_type_combo.currentText(),
             self.run_on_startup_check.isChecked(),
             self.ssh_username_edit.text().strip() or None,
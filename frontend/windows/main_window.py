@@ -1,39 +1,40 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Callable
+from typing import TYPE_CHECKING
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QMessageBox, QPushButton, QScrollArea
-from PySide6.QtGui import QIcon
-from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QMessageBox, QPushButton
+from PySide6.QtCore import Qt, QThread, Signal, Slot
 
-from frontend.windows.new_proxy_dialog import NewProxyDialog
-from frontend.windows.edit_proxy_dialog import EditProxyDialog
 from frontend.widgets.proxy_list import ProxyListWidget, ProxyStatus
-from core.services.proxy_config_service import ConfigService
-from core.services.proxy_runner_service import ProxyRunnerService
+from frontend.workers.proxy_runner_worker import ProxyRunnerWorker
 
-@dataclass
-class MainWindowDependencies:
-    icon: QIcon
-    tray_show_message: Callable[[str, str], None]
-    exit_service: Callable[[], None]
-    config_service: ConfigService
-    proxy_runner: ProxyRunnerService
+if TYPE_CHECKING:
+    from frontend.app_services import AppServices
 
 class MainWindow(QWidget):
-    def __init__(self, deps: MainWindowDependencies):
+    # Config writes fail on the writer thread; the signal carries the error to this thread
+    _config_save_failed = Signal(str)
+    
+    def __init__(self, deps: AppServices):
         super().__init__()
         self.deps = deps
+        self._close_box: QMessageBox | None = None  # Built on first close
+        self._icon_set = False  # App window icon is applied on first show
 
         self.setWindowTitle("SProxy2")
-        self.setWindowIcon(deps.icon)
         self.resize(600, 400)
 
         layout = QVBoxLayout(self)
         
         # Header with add button
         header_layout = QVBoxLayout()
-        header_layout.addWidget(QLabel("<h2>Simple Proxy 2</h2>"))
+        # Plain text with a larger bold font; no rich-text document behind the label
+        title = QLabel("Simple Proxy 2")
+        title.setTextFormat(Qt.PlainText)
+        title_font = title.font()
+        title_font.setPointSize(title_font.pointSize() + 4)
+        title_font.setBold(True)
+        title.setFont(title_font)
+        header_layout.addWidget(title)
         
         new_proxy_btn = QPushButton("Add New Proxy")
         new_proxy_btn.clicked.connect(self._open_new_proxy_dialog)
@@ -41,83 +42,109 @@ class MainWindow(QWidget):
         
         layout.addLayout(header_layout)
         
-        # Proxy list in scroll area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QScrollArea.NoFrame)
-        
+        # Proxy list (its view scrolls by itself)
         self.proxy_list = ProxyListWidget(deps.config_service, deps.proxy_runner)
         self.proxy_list.proxy_started.connect(self._on_start_proxy)
         self.proxy_list.proxy_stopped.connect(self._on_stop_proxy)
         self.proxy_list.proxy_edited.connect(self._on_edit_proxy)
         
-        scroll.setWidget(self.proxy_list)
-        layout.addWidget(scroll)
+        layout.addWidget(self.proxy_list)
+        
+        # Proxy start/stop runs on a worker thread; results come back queued to this thread
+        self._runner_thread = QThread(self)
+        self._runner_worker = ProxyRunnerWorker(deps.proxy_runner)
+        self._runner_worker.moveToThread(self._runner_thread)
+        self._runner_worker.finished.connect(self._on_runner_finished, Qt.QueuedConnection)
+        self._runner_thread.start()
+        QApplication.instance().aboutToQuit.connect(self._stop_runner_thread)
+        
+        self._config_save_failed.connect(self._on_config_save_failed, Qt.QueuedConnection)
+        deps.config_service.add_save_error_listener(lambda e: self._config_save_failed.emit(str(e)))
     
+    def showEvent(self, event) -> None:
+        if not self._icon_set:
+            # App-wide, so dialogs opened from this window pick it up too
+            self._icon_set = True
+            QApplication.instance().setWindowIcon(self.deps.icon.get())
+        super().showEvent(event)
+    
+    @Slot()
+    def _stop_runner_thread(self) -> None:
+        self._runner_thread.quit()
+        self._runner_thread.wait()
+    
+    @Slot(str)
+    def _on_config_save_failed(self, error: str) -> None:
+        """A queued config write didn't reach disk; the change only lives in memory."""
+        QMessageBox.critical(self, "Error", f"Failed to save config: {error}")
+    
+    @Slot(str)
     def _on_start_proxy(self, name: str) -> None:
         """Handle proxy start request."""
-        try:
-            proxy_config = self.deps.config_service.config.proxies.get(name)
-            if not proxy_config:
-                QMessageBox.warning(self, "Error", f"Proxy '{name}' not found")
-                return
-            
-            self.deps.proxy_runner.start_proxy(name, proxy_config)
-            self.proxy_list.set_proxy_status(name, ProxyStatus.RUNNING)
-            self.deps.tray_show_message("Proxy Started", f"Started proxy '{name}'")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to start proxy: {e}")
+        proxy_config = self.deps.config_service.config.proxies.get(name)
+        if not proxy_config:
+            QMessageBox.warning(self, "Error", f"Proxy '{name}' not found")
+            return
+        
+        self._runner_worker.start_requested.emit(name, proxy_config)
     
+    @Slot(str)
     def _on_stop_proxy(self, name: str) -> None:
         """Handle proxy stop request."""
-        try:
-            self.deps.proxy_runner.stop_proxy(name)
+        self._runner_worker.stop_requested.emit(name)
+    
+    @Slot(str, bool, str)
+    def _on_runner_finished(self, name: str, is_running: bool, error: str) -> None:
+        """Show the outcome of a start/stop request handled by the runner worker."""
+        if error:
+            action = "stop" if is_running else "start"
+            QMessageBox.critical(self, "Error", f"Failed to {action} proxy: {error}")
+            return
+        
+        if is_running:
+            self.proxy_list.set_proxy_status(name, ProxyStatus.RUNNING)
+            self.deps.tray_show_message("Proxy Started", f"Started proxy '{name}'")
+        else:
             self.proxy_list.set_proxy_status(name, ProxyStatus.STOPPED)
             self.deps.tray_show_message("Proxy Stopped", f"Stopped proxy '{name}'")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to stop proxy: {e}")
     
+    @Slot(str)
     def _on_edit_proxy(self, name: str) -> None:
         """Handle proxy edit request."""
-        proxy_config = self.deps.config_service.config.proxies.get(name)
+        config_service = self.deps.config_service
+        proxy_config = config_service.config.proxies.get(name)
         if not proxy_config:
             QMessageBox.warning(self, "Error", f"Proxy '{name}' not found")
             return
         
+        # Dialogs are imported on first use to keep startup light
+        from frontend.windows.edit_proxy_dialog import EditProxyDialog
         dialog = EditProxyDialog(name, proxy_config, self)
         if dialog.exec():
             new_name, addr, listen_port, bind_port, proxy_type, run_on_startup, ssh_username = dialog.get_values()
             try:
-                # If name changed, remove old and add new
-                if new_name != name:
-                    self.deps.config_service.remove_proxy(name)
-                    self.deps.config_service.add_proxy(
-                        new_name, addr, listen_port, bind_port,
-                        proxy_type=proxy_type,
-                        run_on_startup=run_on_startup,
-                        ssh_username=ssh_username
-                    )
-                else:
-                    # Update existing proxy
-                    self.deps.config_service.remove_proxy(name)
-                    self.deps.config_service.add_proxy(
-                        new_name, addr, listen_port, bind_port,
-                        proxy_type=proxy_type,
-                        run_on_startup=run_on_startup,
-                        ssh_username=ssh_username
-                    )
+                # Replace the old entry (the name may have changed) in one write
+                config_service.update_proxy(
+                    name, new_name, addr, listen_port, bind_port,
+                    proxy_type=proxy_type,
+                    run_on_startup=run_on_startup,
+                    ssh_username=ssh_username
+                )
                 
                 self.proxy_list.refresh()
                 self.deps.tray_show_message("Success", f"Proxy '{new_name}' updated successfully")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to edit proxy: {e}")
 
+    @Slot()
     def _open_new_proxy_dialog(self):
-        dialog = NewProxyDialog(self.deps.config_service, self)
+        from frontend.windows.new_proxy_dialog import NewProxyDialog
+        config_service = self.deps.config_service
+        dialog = NewProxyDialog(config_service, self)
         if dialog.exec():
             name, addr, listen_port, bind_port, proxy_type, run_on_startup, ssh_username = dialog.get_values()
             try:
-                self.deps.config_service.add_proxy(
+                config_service.add_proxy(
                     name, addr, listen_port, bind_port,
                     proxy_type=proxy_type,
                     run_on_startup=run_on_startup,
@@ -128,29 +155,36 @@ class MainWindow(QWidget):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to add proxy: {e}")
 
-    def closeEvent(self, event):
+    def _ensure_close_box(self) -> None:
+        """Build the close confirmation once; later closes reuse it."""
+        if self._close_box is not None:
+            return
         box = QMessageBox(self)
         box.setIcon(QMessageBox.Warning)
         box.setWindowTitle("Exit SProxy2?")
         box.setText("Close the service completely or just hide the window?")
         box.setInformativeText("If you hide it, the service keeps running in the background (tray).")
 
-        hide_btn = box.addButton("Hide to tray", QMessageBox.AcceptRole)
-        exit_btn = box.addButton("Exit service", QMessageBox.DestructiveRole)  # FIXED
+        self._close_hide_btn = box.addButton("Hide to tray", QMessageBox.AcceptRole)
+        self._close_exit_btn = box.addButton("Exit service", QMessageBox.DestructiveRole)  # FIXED
         box.addButton("Cancel", QMessageBox.RejectRole)
 
-        box.setDefaultButton(hide_btn)
-        box.exec()
+        box.setDefaultButton(self._close_hide_btn)
+        self._close_box = box
+
+    def closeEvent(self, event):
+        self._ensure_close_box()
+        self._close_box.exec()
 
-        clicked = box.clickedButton()
-        if clicked == hide_btn:
+        clicked = self._close_box.clickedButton()
+        if clicked == self._close_hide_btn:
             event.ignore()
             self.hide()
             self.deps.tray_show_message(
                 "SProxy2",
                 "Still running in the background. Use the tray menu to quit.",
             )
-        elif clicked == exit_btn:
+        elif clicked == self._close_exit_btn:
             event.accept()
             self.deps.exit_service()
         else:
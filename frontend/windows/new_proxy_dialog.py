@@ -1,17 +1,19 @@
 ﻿from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout,
-    QLineEdit, QSpinBox, QDialogButtonBox, QMessageBox, QComboBox, QCheckBox
+    QLineEdit, QDialogButtonBox, QMessageBox, QComboBox, QCheckBox
 )
+from PySide6.QtCore import Slot
+from PySide6.QtGui import QIntValidator
 from core.services.proxy_config_service import ConfigService
 
 
 def _get_next_available_port(config_service: ConfigService, start_port: int = 1080) -> int:
     """Find the next available port after start_port by checking used ports."""
+    if start_port == 1080:
+        # The default search is cached on the config service between changes
+        return config_service.next_free_port()
     used_ports = {proxy.listen_port for proxy in config_service.config.proxies.values()}
-    port = start_port
-    while port in used_ports and port < 65535:
-        port += 1
-    return port
+    return next((port for port in range(start_port, 65535) if port not in used_ports), 65535)
 
 
 class NewProxyDialog(QDialog):
@@ -21,6 +23,9 @@ class NewProxyDialog(QDialog):
         self.setModal(True)
         self.config_service = config_service
 
+        self._build_ui()
+
+    def _build_ui(self) -> None:
         layout = QVBoxLayout(self)
         form = QFormLayout()
 
@@ -29,16 +34,16 @@ class NewProxyDialog(QDialog):
 
         self.listen_address_edit = QLineEdit("127.0.0.1")
 
-        self.listen_port_spin = QSpinBox()
-        self.listen_port_spin.setRange(1, 65535)
-        self.listen_port_spin.setValue(22)
+        # Plain line edits restricted to valid ports; lighter than spin boxes
+        port_validator = QIntValidator(1, 65535, self)
+        self.listen_port_edit = QLineEdit("22")
+        self.listen_port_edit.setValidator(port_validator)
 
         # Get next available port
-        next_port = _get_next_available_port(config_service) if config_service else 1080
+        next_port = _get_next_available_port(self.config_service) if self.config_service else 1080
 
-        self.bind_port_spin = QSpinBox()
-        self.bind_port_spin.setRange(1, 65535)
-        self.bind_port_spin.setValue(next_port)
+        self.bind_port_edit = QLineEdit(str(next_port))
+        self.bind_port_edit.setValidator(port_validator)
 
         self.proxy_type_combo = QComboBox()
         self.proxy_type_combo.addItems(["socks5", "http"])
@@ -50,8 +55,8 @@ class NewProxyDialog(QDialog):
 
         form.addRow("Name:", self.name_edit)
         form.addRow("Listen Address:", self.listen_address_edit)
-        form.addRow("SSH Port:", self.listen_port_spin)
-        form.addRow("Bind Port:", self.bind_port_spin)
+        form.addRow("SSH Port:", self.listen_port_edit)
+        form.addRow("Bind Port:", self.bind_port_edit)
         form.addRow("Proxy Type:", self.proxy_type_combo)
         form.addRow("SSH Username:", self.ssh_username_edit)
         form.addRow("Run on Startup:", self.run_on_startup_check)
@@ -63,6 +68,7 @@ class NewProxyDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
 
+    @Slot()
     def _on_accept(self) -> None:
         name = self.name_edit.text().strip()
         addr = self.listen_address_edit.text().strip()
@@ -73,6 +79,9 @@ class NewProxyDialog(QDialog):
         if not addr:
             QMessageBox.warning(self, "Invalid input", "Listen address is required.")
             return
+        if not (self.listen_port_edit.hasAcceptableInput() and self.bind_port_edit.hasAcceptableInput()):
+            QMessageBox.warning(self, "Invalid input", "Ports must be between 1 and 65535.")
+            return
 
         # TODO: Check here for port collisions, fine for now but annoying UX
         self.accept()
@@ -81,8 +90,8 @@ class NewProxyDialog(QDialog):
         return (
             self.name_edit.text().strip(),
             self.listen_address_edit.text().strip(),
-            self.listen_port_spin.value(),
-            self.bind_port_spin.value(),
+            int(self.listen_port_edit.text()),
+            int(self.bind_port_edit.text()),
             self.proxy_type_combo.currentText(),
             self.run_on_startup_check.isChecked(),
             self.ssh_username_edit.text().strip() or None,
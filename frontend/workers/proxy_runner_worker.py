@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QObject, Qt, Signal, Slot
+
+from core.config.proxy_config_parser import ProxyConfig
+from core.services.proxy_runner_service import ProxyRunnerService
+
+
+class ProxyRunnerWorker(QObject):
+    """Runs ProxyRunnerService start/stop calls on a worker thread so the UI never blocks."""
+    
+    start_requested = Signal(str, object)  # Proxy name, ProxyConfig
+    stop_requested = Signal(str)           # Proxy name
+    finished = Signal(str, bool, str)      # Proxy name, is running, error message ("" on success)
+    
+    def __init__(self, proxy_runner: ProxyRunnerService):
+        super().__init__()
+        self._proxy_runner = proxy_runner
+        # Queued so the slots run in whichever thread the worker was moved to
+        self.start_requested.connect(self._start_proxy, Qt.QueuedConnection)
+        self.stop_requested.connect(self._stop_proxy, Qt.QueuedConnection)
+    
+    @Slot(str, object)
+    def _start_proxy(self, name: str, config: ProxyConfig) -> None:
+        try:
+            self._proxy_runner.start_proxy(name, config)
+        except Exception as e:
+            self.finished.emit(name, False, str(e))
+            return
+        self.finished.emit(name, True, "")
+    
+    @Slot(str)
+    def _stop_proxy(self, name: str) -> None:
+        try:
+            self._proxy_runner.stop_proxy(name)
+        except Exception as e:
+            self.finished.emit(name, True, str(e))
+            return
+        self.finished.emit(name, False, "")
@@ -37,11 +37,12 @@ if (-not (Test-Path $mainPath)) {
 }
 
 # --- Task config ---
+# -OO drops docstrings and asserts from the cached bytecode; nothing reads them at runtime
 $taskName  = "sproxy-tray"
 
 $action = New-ScheduledTaskAction `
     -Execute "`"$python`"" `
-    -Argument "`"$mainPath`"" `
+    -Argument "-OO `"$mainPath`"" `
     -WorkingDirectory "`"$scriptDir`""
 
 $trigger = New-ScheduledTaskTrigger -AtLogOn
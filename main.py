@@ -1,38 +1,93 @@
 import sys
-import ctypes
 import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(
-    "com.yourname.yourapp"
-)
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QIcon
 
-from frontend.windows.main_window import MainWindow, MainWindowDependencies
-from frontend.tray.tray_app import TrayApp, TrayDependencies
 from core.services.proxy_config_service import ConfigService
 from core.services.proxy_runner_service import ProxyRunnerService
 from core.config.proxy_config_parser import write_default_config
 
+# Directory holding config.toml and assets/, independent of the launch CWD
+APP_DIR = Path(sys.argv[0]).resolve().parent if getattr(sys, "frozen", False) else Path(__file__).resolve().parent
+
+# Parsed once for the whole app; widgets opt in through their object names
+_APP_STYLESHEET = "QLabel#emptyProxyList { color: gray; padding: 20px; }"
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Use a libuv loop when installed (winloop on Windows, uvloop elsewhere), else the stdlib loop."""
+    try:
+        if sys.platform == "win32":
+            import winloop as libuv_loop
+        else:
+            import uvloop as libuv_loop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return libuv_loop.new_event_loop()
+
+
+def _start_loop_in_thread() -> asyncio.AbstractEventLoop:
+    """Run a new event loop on a daemon thread and return it once it is spinning."""
+    loop = _new_event_loop()
+    # Under `python -X dev` / PYTHONASYNCIODEBUG=1, log anything that blocks the proxy loop for 50 ms+
+    loop.slow_callback_duration = 0.05
+    ready = threading.Event()
+    loop.call_soon(ready.set)  # First callback run_forever() executes
+    threading.Thread(target=loop.run_forever, name="asyncio-loop", daemon=True).start()
+    ready.wait()
+    return loop
+
+
+def _icon_path() -> str:
+    """The embedded icon when assets_rc.py has been generated, else the PNG on disk."""
+    try:
+        import assets_rc  # noqa: F401  Registers :/icon.png (pyside6-rcc assets.qrc -o assets_rc.py)
+    except ImportError:
+        return str(APP_DIR / "assets" / "icon.png")
+    return ":/icon.png"
+
+
+def _load_config_service(config_path: Path) -> ConfigService:
+    if not config_path.exists():
+        write_default_config(config_path)
+    return ConfigService(config_path)
+
+
 def main():
-    app = QApplication(sys.argv)
-    app.setQuitOnLastWindowClosed(False) # Keep app running after main window is closed
+    if sys.platform == "win32":
+        # Own taskbar identity on Windows; set here so importing main has no side effects
+        import ctypes
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(
+            "com.yourname.yourapp"
+        )
     
-    icon = QIcon("assets/icon.png")
-    app.setWindowIcon(icon)
+    config_path = APP_DIR / "config.toml"
     
-    config_path = Path("config.toml")
-    if not config_path.exists():
-        write_default_config(config_path)
+    # Config I/O and the asyncio loop thread run while Qt is imported and initialized
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="startup") as executor:
+        config_future = executor.submit(_load_config_service, config_path)
+        
+        loop = _start_loop_in_thread()
+        
+        # Qt and the frontend are the bulk of import time; load them only when the app runs
+        from PySide6.QtWidgets import QApplication
+        
+        from frontend.icons import LazyIcon
+        from frontend.app_services import AppServices
+        from frontend.windows.main_window import MainWindow
+        from frontend.tray.tray_app import TrayApp
+        
+        app = QApplication(sys.argv)
+        app.setQuitOnLastWindowClosed(False) # Keep app running after main window is closed
+        app.setStyleSheet(_APP_STYLESHEET)
+        
+        # Decoded on first use; window, tray and dialogs all share it
+        icon = LazyIcon(_icon_path())
+        
+        config_service = config_future.result()
     
-    config_service = ConfigService(config_path)
     proxy_runner = ProxyRunnerService()
-    
-    # Create and start asyncio event loop in a background thread
-    loop = asyncio.new_event_loop()
-    thread = threading.Thread(target=loop.run_forever, daemon=True)
-    thread.start()
     proxy_runner.set_event_loop(loop)
     
     # Start proxies marked with run_on_startup
@@ -43,27 +98,23 @@ def main():
             except Exception as e:
                 print(f"Warning: Failed to auto-start proxy '{proxy_name}': {e}")
     
-    tray = TrayApp(TrayDependencies(
-        app = app,
-        icon = icon,
-        main_window = None,  # Set after creating main window
-        config_service = config_service,
-        proxy_runner = proxy_runner,
-    ))
-    
-    # Create main window with tray callbacks
-    win = MainWindow(MainWindowDependencies(
+    # One container shared by the tray and the main window
+    services = AppServices(
+        app=app,
         icon=icon,
-        tray_show_message=tray.show_message,
-        exit_service=tray.exit_app,
         config_service=config_service,
         proxy_runner=proxy_runner,
-    ))
-    win.hide()  # Start with the main window hidden
+    )
+    services.tray = TrayApp(services)  # Fills in tray_show_message / exit_service
     
-    tray.deps.main_window = win
+    win = MainWindow(services)
+    win.hide()  # Start with the main window hidden
+    services.main_window = win
     
-    return app.exec()
+    exit_code = app.exec()
+    proxy_runner.stop_all()
+    config_service.flush()
+    return exit_code
 
 if __name__ == "__main__":
     raise SystemExit(main())
\ No newline at end of file
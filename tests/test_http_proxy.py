@@ -0,0 +1,152 @@
+import asyncio
+import unittest
+
+from core.config.proxy_config_parser import ProxyConfig
+from core.services.proxies.http_proxy import HttpProxy
+
+
+class _Upstream:
+    """Scripted origin server: answers each request head with the next canned response."""
+
+    def __init__(self, responses: list[bytes]):
+        self.responses = list(responses)
+        self.requests: list[bytes] = []
+        self.connections = 0
+        self.server: asyncio.Server | None = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while self.responses:
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = 0
+                for line in head.split(b'\r\n'):
+                    if line.lower().startswith(b'content-length:'):
+                        length = int(line.split(b':', 1)[1])
+                body = await reader.readexactly(length) if length else b''
+                self.requests.append(head + body)
+                response = self.responses.pop(0)
+                writer.write(response)
+                await writer.drain()
+                if b'Connection: close' in response:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+class HttpProxyForwardingTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.proxy = HttpProxy(ProxyConfig('127.0.0.1', 8080, 8080, 'http'))
+        self.proxy._ensure_stop_event()
+        self.server = await asyncio.start_server(self.proxy._handle_client, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.proxy._close_pool()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _request(self, raw: bytes) -> bytes:
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        writer.write(raw)
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        return data
+
+    async def _roundtrip(self, responses: list[bytes], request_for) -> tuple[_Upstream, list[bytes]]:
+        upstream = _Upstream(responses)
+        port = await upstream.start()
+        try:
+            replies = [await self._request(request_for(port)) for _ in range(len(responses))]
+        finally:
+            await upstream.close()
+        return upstream, replies
+
+    async def test_content_length_response_is_relayed_and_connection_reused(self):
+        response = b'HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello'
+        upstream, replies = await self._roundtrip(
+            [response, response],
+            lambda port: f'GET http://127.0.0.1:{port}/x HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n\r\n'.encode(),
+        )
+        self.assertEqual(replies, [response, response])
+        self.assertEqual(upstream.connections, 1)
+        # Host is rebuilt from the target, never sent twice
+        self.assertEqual(upstream.requests[0].lower().count(b'host:'), 1)
+
+    async def test_chunked_response_is_relayed_with_trailers(self):
+        response = b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n5;ext=1\r\nhello\r\n0\r\nX-Trailer: 1\r\n\r\n'
+        upstream, replies = await self._roundtrip(
+            [response, response],
+            lambda port: f'GET http://127.0.0.1:{port}/ HTTP/1.1\r\n\r\n'.encode(),
+        )
+        self.assertEqual(replies, [response, response])
+        self.assertEqual(upstream.connections, 1)
+
+    async def test_unframed_response_runs_until_eof(self):
+        response = b'HTTP/1.0 200 OK\r\nConnection: close\r\n\r\nuntil the end'
+        upstream, replies = await self._roundtrip(
+            [response, response],
+            lambda port: f'GET http://127.0.0.1:{port}/ HTTP/1.1\r\n\r\n'.encode(),
+        )
+        self.assertEqual(replies, [response, response])
+        self.assertEqual(upstream.connections, 2)
+
+    async def test_bodyless_responses_are_not_waited_on(self):
+        for status in (b'204 No Content', b'304 Not Modified'):
+            response = b'HTTP/1.1 ' + status + b'\r\nContent-Length: 10\r\n\r\n'
+            upstream, replies = await self._roundtrip(
+                [response],
+                lambda port: f'GET http://127.0.0.1:{port}/ HTTP/1.1\r\n\r\n'.encode(),
+            )
+            self.assertEqual(replies, [response])
+
+    async def test_head_response_has_no_body(self):
+        response = b'HTTP/1.1 200 OK\r\nContent-Length: 10\r\n\r\n'
+        upstream, replies = await self._roundtrip(
+            [response, response],
+            lambda port: f'HEAD http://127.0.0.1:{port}/ HTTP/1.1\r\n\r\n'.encode(),
+        )
+        self.assertEqual(replies, [response, response])
+        self.assertEqual(upstream.connections, 1)
+
+    async def test_interim_responses_are_skipped(self):
+        response = b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok'
+        upstream, replies = await self._roundtrip(
+            [b'HTTP/1.1 103 Early Hints\r\nLink: </a>\r\n\r\n' + response],
+            lambda port: f'GET http://127.0.0.1:{port}/ HTTP/1.1\r\n\r\n'.encode(),
+        )
+        self.assertEqual(replies, [response])
+
+    async def test_malformed_chunk_closes_upstream(self):
+        bad = b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n'
+        good = b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok'
+        upstream, replies = await self._roundtrip(
+            [bad, good],
+            lambda port: f'GET http://127.0.0.1:{port}/ HTTP/1.1\r\n\r\n'.encode(),
+        )
+        self.assertEqual(replies[1], good)
+        self.assertEqual(upstream.connections, 2)
+
+    async def test_request_body_is_forwarded(self):
+        response = b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok'
+        upstream, replies = await self._roundtrip(
+            [response],
+            lambda port: f'POST http://127.0.0.1:{port}/ HTTP/1.1\r\nContent-Length: 4\r\n\r\nbody'.encode(),
+        )
+        self.assertEqual(replies, [response])
+        self.assertTrue(upstream.requests[0].endswith(b'\r\n\r\nbody'))
+
+
+if __name__ == '__main__':
+    unittest.main()
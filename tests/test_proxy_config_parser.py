@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+
+from core.config import proxy_config_parser as parser
+from core.config.proxy_config_parser import _DEFAULT_CONFIG_BYTES, _parse_config
+
+try:
+    import rtoml
+except ImportError:
+    rtoml = None
+
+# Valid TOML that fails validation: two proxies on the same listen endpoint
+_DUPLICATE_ENDPOINT_CONFIG = b"""
+[proxies.a]
+listen_address = "127.0.0.1"
+listen_port = 1080
+bind_port = 10800
+
+[proxies.b]
+listen_address = "127.0.0.1"
+listen_port = 1080
+bind_port = 10801
+"""
+
+# Valid TOML with a wrongly typed value
+_BOOLEAN_PORT_CONFIG = b"""
+[proxies.a]
+listen_address = "127.0.0.1"
+listen_port = true
+bind_port = 10800
+"""
+
+
+@unittest.skipIf(rtoml is None, "rtoml is not installed")
+class ParserBackendTest(unittest.TestCase):
+    """rtoml is optional, so it must produce exactly what the tomllib fallback does."""
+
+    def _parse_both(self, data: bytes):
+        with mock.patch.object(parser, "rtoml", rtoml):
+            with_rtoml = _parse_config(data)
+        with mock.patch.object(parser, "rtoml", None):
+            with_tomllib = _parse_config(data)
+        return with_rtoml, with_tomllib
+
+    def _errors_from_both(self, data: bytes) -> tuple[str, str]:
+        messages = []
+        for backend in (rtoml, None):
+            with mock.patch.object(parser, "rtoml", backend):
+                with self.assertRaises(ValueError) as ctx:
+                    _parse_config(data)
+            messages.append(str(ctx.exception))
+        return messages[0], messages[1]
+
+    def test_default_config_parses_identically(self):
+        with_rtoml, with_tomllib = self._parse_both(_DEFAULT_CONFIG_BYTES)
+        self.assertEqual(with_rtoml, with_tomllib)
+        self.assertEqual(list(with_rtoml.proxies), ["example"])
+
+    def test_duplicate_endpoint_is_rejected_identically(self):
+        with_rtoml, with_tomllib = self._errors_from_both(_DUPLICATE_ENDPOINT_CONFIG)
+        self.assertEqual(with_rtoml, with_tomllib)
+        self.assertIn("Duplicate listen endpoint 127.0.0.1:1080 for proxy 'b'", with_rtoml)
+
+    def test_wrongly_typed_value_is_rejected_identically(self):
+        with_rtoml, with_tomllib = self._errors_from_both(_BOOLEAN_PORT_CONFIG)
+        self.assertEqual(with_rtoml, with_tomllib)
+
+    def test_malformed_toml_is_a_value_error_for_both(self):
+        # Syntax error messages differ between parsers; both must surface as ValueError
+        self._errors_from_both(b"[proxies.a\nlisten_port = 1")
+
+
+if __name__ == "__main__":
+    unittest.main()